@@ -2,6 +2,27 @@
 
 # Title: GradeBook Analyzer (Simple Version)
 
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# (grade, minimum score) from the highest grade down; anything below the last is FAIL_GRADE.
+GRADE_CUTOFFS = (("A", 90), ("B", 80), ("C", 70), ("D", 60))
+FAIL_GRADE = "F"
+PASS_MARK = 40
+NAME_COLUMN = "name"
+SCORE_COLUMN = "marks"
+BATCH_CHUNKSIZE = 500_000
+COURSE_SUFFIXES = (".csv", ".parquet", ".pq")
+SUMMARY_FILE = "course_summary.csv"
+
 def give_grade(score):
     """Return grade based on score."""
     if score >= 90:
@@ -15,9 +36,335 @@ def give_grade(score):
     else:
         return "F"
 
+def parse_cutoffs(text):
+    """Parse "A=90,B=80,C=70,D=60" into GRADE_CUTOFFS form, highest cutoff first."""
+    cutoffs = []
+    for part in text.split(","):
+        grade, _, minimum = part.partition("=")
+        cutoffs.append((grade.strip(), float(minimum)))
+    return tuple(sorted(cutoffs, key=lambda c: c[1], reverse=True))
+
+
+def _grade_table(cutoffs, fail_grade=FAIL_GRADE):
+    """Ascending threshold array and the matching labels (fail grade first)."""
+    ordered = sorted(cutoffs, key=lambda c: c[1])
+    thresholds = np.array([minimum for _, minimum in ordered], dtype=np.float64)
+    return thresholds, [fail_grade] + [grade for grade, _ in ordered]
+
+
+def _grade_codes(scores, thresholds):
+    codes = np.searchsorted(thresholds, scores, side="right").astype(np.int8)
+    codes[np.isnan(scores)] = 0
+    return codes
+
+
+def grade_scores(scores, cutoffs=GRADE_CUTOFFS, fail_grade=FAIL_GRADE):
+    """
+    Vectorized give_grade: letter grades for a whole array of scores.
+
+    The cutoffs become an ascending threshold array; searchsorted(side="right")
+    counts how many thresholds each score reaches (score >= cutoff), which
+    indexes straight into the grade labels. NaN scores get `fail_grade`, as
+    give_grade would give them. Returns a pandas Categorical.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    thresholds, labels = _grade_table(cutoffs, fail_grade)
+    return pd.Categorical.from_codes(_grade_codes(scores, thresholds), categories=labels)
+
+
+class GradeStats:
+    """
+    Single-pass, constant-memory class statistics for scores in 0-100.
+
+    Keeps count, mean and the sum of squared deviations (Welford/Chan, so
+    chunks and shards combine exactly), min/max, per-grade counts, the pass
+    count at PASS_MARK and a fixed histogram of HIST_BINS bins over 0-100 for
+    approximate percentiles (error at most half a bin). update() takes a
+    single score or an array; merge() folds in another shard's GradeStats.
+    """
+    HIST_BINS = 1000
+
+    def __init__(self, cutoffs=GRADE_CUTOFFS, pass_mark=PASS_MARK):
+        self.thresholds, self.labels = _grade_table(cutoffs)
+        self.pass_mark = pass_mark
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.passed = 0
+        self.grade_counts = np.zeros(len(self.labels), dtype=np.int64)
+        self.histogram = np.zeros(self.HIST_BINS, dtype=np.int64)
+
+    def update(self, scores):
+        scores = np.atleast_1d(np.asarray(scores, dtype=np.float64))
+        scores = scores[~np.isnan(scores)]
+        n = len(scores)
+        if not n:
+            return self
+        chunk_mean = float(scores.mean())
+        chunk_m2 = float(((scores - chunk_mean) ** 2).sum())
+        self._combine(n, chunk_mean, chunk_m2)
+        self.min = min(self.min, float(scores.min()))
+        self.max = max(self.max, float(scores.max()))
+        self.passed += int((scores >= self.pass_mark).sum())
+        self.grade_counts += np.bincount(_grade_codes(scores, self.thresholds), minlength=len(self.labels))
+        bins = np.clip((scores * (self.HIST_BINS / 100.0)).astype(np.int64), 0, self.HIST_BINS - 1)
+        self.histogram += np.bincount(bins, minlength=self.HIST_BINS)
+        return self
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    def merge(self, other):
+        """Adds another GradeStats (same cutoffs) into this one."""
+        if other.labels != self.labels or not np.array_equal(other.thresholds, self.thresholds):
+            raise ValueError("Cannot merge GradeStats built with different cutoffs")
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.passed += other.passed
+            self.grade_counts += other.grade_counts
+            self.histogram += other.histogram
+        return self
+
+    @property
+    def failed(self):
+        return self.count - self.passed
+
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two scores)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return self.variance ** 0.5
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) from the histogram, clamped to [min, max]."""
+        if not self.count:
+            return float("nan")
+        rank = max(q / 100.0 * self.count, 1)
+        index = int(np.searchsorted(np.cumsum(self.histogram), rank))
+        value = (index + 0.5) * 100.0 / self.HIST_BINS
+        return min(max(value, self.min), self.max)
+
+    def distribution(self):
+        """{grade: count}, highest grade first."""
+        return {label: int(count) for label, count in reversed(list(zip(self.labels, self.grade_counts)))}
+
+
+def iter_score_chunks(path, name_col=NAME_COLUMN, score_col=SCORE_COLUMN, chunksize=BATCH_CHUNKSIZE):
+    """
+    Yield DataFrames of at most `chunksize` rows with the name and score
+    columns from a CSV or Parquet file; unreadable scores become NaN.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        batches = (batch.to_pandas() for batch in
+                   pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=[name_col, score_col]))
+    else:
+        batches = pd.read_csv(path, usecols=[name_col, score_col], dtype={name_col: str, score_col: str},
+                              chunksize=chunksize)
+    for df in batches:
+        df[score_col] = pd.to_numeric(df[score_col], errors="coerce")
+        yield df
+
+
+def grade_batch(input_path, output_path, cutoffs=GRADE_CUTOFFS,
+                name_col=NAME_COLUMN, score_col=SCORE_COLUMN, chunksize=BATCH_CHUNKSIZE):
+    """
+    Grade every record in `input_path` and write the report card (Name, Marks,
+    Grade) to `output_path` (CSV or Parquet) in a single streaming pass, chunk
+    by chunk, so memory stays bounded by `chunksize`. Rows with a missing,
+    non-numeric or out-of-range (0-100) score are left out and counted.
+    Returns (GradeStats, number of invalid rows).
+    """
+    stats = GradeStats(cutoffs)
+    invalid = 0
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    to_parquet = output_path.suffix.lower() in (".parquet", ".pq")
+    writer = None
+    header = True
+    try:
+        for df in iter_score_chunks(input_path, name_col, score_col, chunksize):
+            scores = df[score_col].to_numpy(dtype=np.float64)
+            valid = (scores >= 0) & (scores <= 100)
+            invalid += int((~valid).sum())
+            scores = scores[valid]
+            stats.update(scores)
+            report = pd.DataFrame({
+                "Name": df[name_col].to_numpy()[valid],
+                "Marks": scores,
+                "Grade": grade_scores(scores, cutoffs),
+            })
+            if to_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(report, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+                continue
+            if np.array_equal(scores, np.floor(scores)):
+                report["Marks"] = scores.astype(np.int64)
+            report.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+    finally:
+        if writer is not None:
+            writer.close()
+    if header and not to_parquet:
+        pd.DataFrame(columns=["Name", "Marks", "Grade"]).to_csv(output_path, index=False)
+    return stats, invalid
+
+
+def print_batch_summary(stats, invalid=0):
+    print("\n--- Batch Report ---")
+    print("Students graded :", stats.count)
+    if invalid:
+        print("Invalid rows    :", invalid)
+    if not stats.count:
+        return
+    print("Average Marks   :", round(stats.mean, 2))
+    print("Std Deviation   :", round(stats.stdev, 2))
+    print("Highest Marks   :", stats.max)
+    print("Lowest Marks    :", stats.min)
+    print("Median (approx) :", round(stats.percentile(50), 1))
+    print("P10 / P90       :", round(stats.percentile(10), 1), "/", round(stats.percentile(90), 1))
+    print("Passed / Failed :", stats.passed, "/", stats.failed)
+    print("\nGrade distribution:")
+    for grade, count in stats.distribution().items():
+        print(f"  {grade:<3}{count}")
+
+
+def _grade_course(job):
+    """
+    Process-pool worker: grade one course file and return (course, GradeStats,
+    invalid rows, None), or (course, None, 0, error message) if it cannot be
+    graded, so one bad file does not abort the whole run.
+    """
+    path, out_dir, cutoffs, name_col, score_col, chunksize = job
+    path = Path(path)
+    report = Path(out_dir) / f"{path.stem}_report.csv"
+    try:
+        stats, invalid = grade_batch(path, report, cutoffs, name_col, score_col, chunksize)
+    except Exception as e:
+        report.unlink(missing_ok=True)
+        return path.stem, None, 0, f"{type(e).__name__}: {e}"
+    return path.stem, stats, invalid, None
+
+
+def find_course_files(course_dir):
+    return sorted(p for p in Path(course_dir).iterdir() if p.suffix.lower() in COURSE_SUFFIXES)
+
+
+def grade_courses(paths, out_dir, cutoffs=GRADE_CUTOFFS, workers=None,
+                  name_col=NAME_COLUMN, score_col=SCORE_COLUMN, chunksize=BATCH_CHUNKSIZE):
+    """
+    Grade many course files, one task per course, across a process pool
+    (`workers` processes, default one per CPU; 1 runs in-process). Each course
+    gets `<out_dir>/<course>_report.csv`; per-course GradeStats come back to
+    the parent and are merged into institution-wide stats. Courses that fail
+    are reported and left out of the totals.
+    Returns ({course: (GradeStats, invalid)}, institution GradeStats, {course: error}).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(path), str(out_dir), cutoffs, name_col, score_col, chunksize) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    courses, errors = {}, {}
+
+    def collect(results):
+        for course, stats, invalid, error in results:
+            if error is not None:
+                errors[course] = error
+                print(f"  {course}: FAILED ({error})")
+            else:
+                courses[course] = (stats, invalid)
+
+    if workers == 1 or len(jobs) <= 1:
+        collect(map(_grade_course, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Small courses are batched so per-task IPC does not dominate.
+            batch = max(1, len(jobs) // (workers * 8))
+            collect(pool.map(_grade_course, jobs, chunksize=batch))
+    institution = GradeStats(cutoffs)
+    for stats, _ in courses.values():
+        institution.merge(stats)
+    return courses, institution, errors
+
+
+def write_course_summary(courses, institution, path, errors=None):
+    """
+    One row per course plus an INSTITUTION total: counts, mean/stdev, min/max,
+    median and grade counts. Courses in `errors` get a row with only the Error column.
+    """
+    rows = []
+    for course, (stats, invalid) in list(courses.items()) + [("INSTITUTION", (institution, None))]:
+        row = {"Course": course, "Students": stats.count,
+               "Invalid": invalid if invalid is not None else sum(i for _, i in courses.values()),
+               "Mean": round(stats.mean, 2), "Stdev": round(stats.stdev, 2),
+               "Min": stats.min if stats.count else None, "Max": stats.max if stats.count else None,
+               "Median": round(stats.percentile(50), 1) if stats.count else None,
+               "Passed": stats.passed, "Failed": stats.failed}
+        row.update(stats.distribution())
+        row["Error"] = None
+        rows.append(row)
+    failed = [{"Course": course, "Error": error} for course, error in (errors or {}).items()]
+    summary = pd.DataFrame(rows[:-1] + failed + rows[-1:])
+    counts = ["Students", "Invalid", "Passed", "Failed"] + list(institution.distribution())
+    summary[counts] = summary[counts].astype("Int64")   # stay integers next to failed-course rows
+    summary.to_csv(path, index=False)
+
+
+def make_sample_courses(course_dir, courses=200, students=20_000, seed=0):
+    """Write `courses` synthetic course CSVs of `students` rows each for benchmarking."""
+    course_dir = Path(course_dir)
+    course_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = np.array([f"student{i:06d}" for i in range(students)])
+    for c in range(courses):
+        marks = rng.normal(rng.uniform(55, 75), 15, students).round().clip(0, 100).astype(np.int64)
+        pd.DataFrame({NAME_COLUMN: names, SCORE_COLUMN: marks}).to_csv(course_dir / f"course{c:04d}.csv", index=False)
+
+
+def run_benchmark(courses=200, students=20_000, worker_counts=None):
+    """Time grade_courses on synthetic data for increasing worker counts and print throughput and speedup."""
+    cpus = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    tmp = Path(tempfile.mkdtemp(prefix="gradebook_bench_"))
+    try:
+        make_sample_courses(tmp / "courses", courses, students)
+        paths = find_course_files(tmp / "courses")
+        total = courses * students
+        print(f"Benchmark: {courses} courses x {students} students = {total:,} records, {cpus} CPU(s)")
+        print(f"{'workers':>8}{'seconds':>10}{'records/s':>14}{'speedup':>9}")
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            _, institution, _ = grade_courses(paths, tmp / f"out{workers}", workers=workers)
+            elapsed = time.perf_counter() - start
+            assert institution.count == total
+            baseline = baseline or elapsed
+            print(f"{workers:>8}{elapsed:>10.2f}{total / elapsed:>14,.0f}{baseline / elapsed:>8.2f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
 def main():
     print("=== GradeBook Analyzer ===")
     marks = {}
+    stats = GradeStats()
 
     # Enter marks for 3 students
     for i in range(3):
@@ -27,6 +374,7 @@ def main():
                 mark = int(input(f"Enter marks for {name} (0–100): "))
                 if 0 <= mark <= 100:
                     marks[name] = mark
+                    stats.update(mark)
                     break
                 else:
                     print("Marks must be between 0 and 100.")
@@ -43,25 +391,57 @@ def main():
     for name in marks:
         print(f"{name:<15}{marks[name]:<10}{grades[name]}")
 
-    # Stats
-    scores = list(marks.values())
-    avg = sum(scores) / len(scores)
-    highest = max(scores)
-    lowest = min(scores)
-
+    # Stats (accumulated as marks were entered)
     print("\n--- Class Stats ---")
-    print("Average Marks :", round(avg, 2))
-    print("Highest Marks :", highest)
-    print("Lowest Marks  :", lowest)
+    print("Average Marks :", round(stats.mean, 2))
+    print("Highest Marks :", int(stats.max))
+    print("Lowest Marks  :", int(stats.min))
 
     # Pass / Fail
-    passed = [n for n, m in marks.items() if m >= 40]
-    failed = [n for n, m in marks.items() if m < 40]
+    passed = [n for n, m in marks.items() if m >= PASS_MARK]
+    failed = [n for n, m in marks.items() if m < PASS_MARK]
 
     print("\nPassed Students :", ", ".join(passed) if passed else "None")
     print("Failed Students :", ", ".join(failed) if failed else "None")
 
     print("\n--- End of Report ---")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GradeBook Analyzer")
+    parser.add_argument("--batch", metavar="FILE", help="grade every record in a CSV or Parquet file")
+    parser.add_argument("--out", default="report_card.csv", help="report card for --batch (.csv or .parquet)")
+    parser.add_argument("--name-col", default=NAME_COLUMN)
+    parser.add_argument("--score-col", default=SCORE_COLUMN)
+    parser.add_argument("--cutoffs", type=parse_cutoffs, default=GRADE_CUTOFFS,
+                        help='grade cutoffs, e.g. "A=90,B=80,C=70,D=60"')
+    parser.add_argument("--chunksize", type=int, default=BATCH_CHUNKSIZE, help="rows per chunk for --batch")
+    parser.add_argument("--courses", metavar="DIR", help="grade every course file (.csv/.parquet) in DIR")
+    parser.add_argument("--out-dir", default="reports", help="report cards and summary for --courses")
+    parser.add_argument("--workers", type=int, default=None, help="processes for --courses (default: CPU count)")
+    parser.add_argument("--benchmark", action="store_true", help="measure --courses throughput on synthetic data")
+    parser.add_argument("--bench-courses", type=int, default=200)
+    parser.add_argument("--bench-students", type=int, default=20_000)
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.benchmark:
+        run_benchmark(args.bench_courses, args.bench_students,
+                      sorted({1, args.workers}) if args.workers else None)
+    elif args.courses:
+        paths = find_course_files(args.courses)
+        courses, institution, errors = grade_courses(paths, args.out_dir, args.cutoffs, args.workers,
+                                                     args.name_col, args.score_col, args.chunksize)
+        summary = Path(args.out_dir) / SUMMARY_FILE
+        write_course_summary(courses, institution, summary, errors)
+        print(f"Graded {len(courses)} courses" + (f", {len(errors)} failed" if errors else ""))
+        print_batch_summary(institution, sum(invalid for _, invalid in courses.values()))
+        print(f"\nReport cards and {SUMMARY_FILE} written to {args.out_dir}")
+    elif args.batch:
+        stats, invalid = grade_batch(args.batch, args.out, args.cutoffs, args.name_col, args.score_col,
+                                     args.chunksize)
+        print_batch_summary(stats, invalid)
+        print(f"\nReport card written to {args.out}")
+    else:
+        main()
\ No newline at end of file
@@ -1,33 +1,253 @@
 # Name = Tushar
 # Roll no.= 2501730053
+import os
+import re
+import csv
+import time
+import random
+import signal
+import asyncio
+import contextlib
 import sys
 import json
+import shutil
+import heapq
+import sqlite3
 import logging
+import logging.handlers
+import queue
+import atexit
+import argparse
+from abc import ABC, abstractmethod
+from enum import IntEnum
+from array import array
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, catalogs are not protected against a second process
+    fcntl = None
 
 LOG_FILE = 'library_manager.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+LOG_QUEUE_SIZE = 10000
+LOG_RATE_LIMIT_WINDOW = 10.0
 logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                    format=LOG_FORMAT,
                     handlers=[
                         logging.FileHandler(LOG_FILE, mode='a'),
                         logging.StreamHandler(sys.stdout)
                     ])
 logger = logging.getLogger('LibraryApp')
 
+JOURNAL_COMPACT_THRESHOLD = 1000
+_TOKEN_RE = re.compile(r"\w+")
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+IMPORT_BATCH_SIZE = 10000
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+SERVICE_COMMIT_INTERVAL = 0.005
+SERVICE_COMPACT_THRESHOLD = 100000
+PAGE_SIZE = 20
+TOP_N = 10
+SECONDS_PER_DAY = 86400
+HISTORY_CHECKPOINT_BYTES = 1_000_000
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets the first WARNING-or-worse record with a given message through, then
+    drops identical repeats for `window` seconds. The next copy that gets
+    through notes how many were suppressed. Lower levels are never limited.
+    """
+    MAX_TRACKED = 1024
+
+    def __init__(self, window: float = LOG_RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.window = window
+        self._seen: Dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.window <= 0:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        if len(self._seen) >= self.MAX_TRACKED:
+            self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+        state = self._seen.get(key)
+        if state is not None and now - state[0] < self.window:
+            state[1] += 1
+            return False
+        if state is not None and state[1]:
+            record.msg = f"{record.getMessage()} (suppressed {state[1]} similar messages)"
+            record.args = None
+        self._seen[key] = [now, 0]
+        return True
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue that never blocks the caller: when the
+    listener falls behind, records are dropped and counted instead. Formatting
+    (including exc_info tracebacks) is left to the listener thread.
+    """
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args now (they may be mutated later) but leave the record
+        # otherwise untouched; the stock prepare() formats it on this thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room, so stop() works even with a full bounded queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(async_mode: bool = False, json_lines: bool = False,
+                      queue_size: int = LOG_QUEUE_SIZE,
+                      rate_limit: float = 0.0) -> Optional[logging.handlers.QueueListener]:
+    """
+    Replaces the default handlers. With `async_mode`, the log file and stdout
+    handlers run on a QueueListener thread behind a BoundedQueueHandler, so the
+    calling code only pays for an enqueue. `json_lines` writes the log file as
+    JSON lines. A positive `rate_limit` suppresses identical warnings repeated
+    within that many seconds (a filter on the LibraryApp logger). Returns the listener (already started, stopped at exit) or None.
+    """
+    file_handler = logging.FileHandler(LOG_FILE, mode='a')
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT))
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for existing in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+        logger.removeFilter(existing)
+    if rate_limit > 0:
+        logger.addFilter(RateLimitFilter(rate_limit))
+
+    listener = None
+    if async_mode:
+        queue_handler = BoundedQueueHandler(queue_size)
+        root.addHandler(queue_handler)
+        listener = _DrainingQueueListener(queue_handler.queue, file_handler, stream_handler,
+                                          respect_handler_level=True)
+        listener.start()
+
+        def _stop_listener():
+            listener.stop()   # blocks until the backlog is written (see _DrainingQueueListener)
+            if queue_handler.dropped:
+                file_handler.handle(logging.makeLogRecord({
+                    'name': logger.name, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f"Log queue full: dropped {queue_handler.dropped} records"}))
+            file_handler.close()
+
+        atexit.register(_stop_listener)
+    else:
+        root.addHandler(file_handler)
+        root.addHandler(stream_handler)
+    return listener
+
+
+
+class BookStatus(IntEnum):
+    """
+    Circulation state of a Book; stored as a small enum instead of a free-form string.
+    OTHER stands for any status string outside available/issued (e.g. 'lost'),
+    which Book keeps verbatim so it survives a load/save round trip.
+    """
+    AVAILABLE = 0
+    ISSUED = 1
+    OTHER = 2
+
+    @classmethod
+    def parse(cls, value) -> 'BookStatus':
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown book status: {value!r}") from None
+
+    @property
+    def label(self) -> str:
+        return _STATUS_LABELS[self]
+
+
+_STATUS_LABELS = {BookStatus.AVAILABLE: 'available', BookStatus.ISSUED: 'issued', BookStatus.OTHER: 'other'}
 
 
 class Book:
     """
     Represents a single book in the library inventory[cite: 17].
     Attributes: title, author, isbn, status ('available' or 'issued') [cite: 18]
+
+    Uses __slots__, keeps the status as a BookStatus and interns author names
+    (shared across many titles), so large catalogs stay small in memory. `status`
+    still reads and accepts the lowercase strings. An unrecognised status is
+    kept as-is (BookStatus.OTHER) with a warning, so it can neither be issued
+    nor returned but is never dropped from the catalog.
     """
+    __slots__ = ('title', 'author', 'isbn', '_status', '_other_status')
+
     def __init__(self, title: str, author: str, isbn: str, status: str = 'available'):
         """Initializes a new Book instance."""
-        self.title = title
-        self.author = author
+        self.title = title if isinstance(title, str) else str(title)
+        self.author = sys.intern(author if isinstance(author, str) else str(author))
         self.isbn = isbn
-        self.status = status.lower() 
+        self.status = status
+
+    @property
+    def status(self) -> str:
+        if self._status is BookStatus.OTHER:
+            return self._other_status
+        return self._status.label
+
+    @status.setter
+    def status(self, value):
+        self._other_status = None
+        if isinstance(value, BookStatus):
+            self._status = value
+            return
+        try:
+            self._status = BookStatus.parse(value)
+        except ValueError:
+            self._status = BookStatus.OTHER
+        if self._status is BookStatus.OTHER:
+            logger.warning("Book %s has unrecognised status %r; keeping it as-is", self.isbn, value)
+            self._other_status = str(value)
 
     def __str__(self):
         """Returns a human-readable string representation of the Book."""
@@ -44,32 +264,690 @@ class Book:
         
     def issue(self) -> bool:
         """Changes the book status to 'issued' if currently 'available'."""
-        if self.is_available():
-            self.status = 'issued'
+        if self._status is BookStatus.AVAILABLE:
+            self._status = BookStatus.ISSUED
             return True
         return False
 
     def return_book(self) -> bool:
         """Changes the book status to 'available' if currently 'issued'."""
-        if self.status == 'issued':
-            self.status = 'available'
+        if self._status is BookStatus.ISSUED:
+            self._status = BookStatus.AVAILABLE
             return True
         return False
 
     def is_available(self) -> bool:
         """Checks if the book is currently 'available'."""
-        return self.status == 'available'
+        return self._status is BookStatus.AVAILABLE
+
+
+
+class _FieldIndex:
+    """
+    Index over one Book field: lowercased values, a token inverted index with a
+    sorted vocabulary for prefix lookups, and character trigrams for substrings.
+    Posting lists are compact arrays of document ids in insertion order. The
+    trigrams are most of the cost, so they are built on the first substring
+    query rather than with the rest.
+    """
+    NGRAM = 3
+
+    def __init__(self):
+        self.lower: List[str] = []
+        self.tokens: Dict[str, array] = {}
+        self.grams: Optional[Dict[str, array]] = None
+        self._vocab: List[str] = []
+        self._vocab_sorted = True
+
+    def add(self, doc_id: int, value: str):
+        text = value.lower()
+        self.lower.append(text)
+        for token in set(_tokenize(text)):
+            postings = self.tokens.get(token)
+            if postings is None:
+                postings = self.tokens[token] = array('I')
+                self._vocab.append(token)
+                self._vocab_sorted = False
+            postings.append(doc_id)
+        if self.grams is not None:
+            self._add_grams(doc_id, text)
+
+    def _add_grams(self, doc_id: int, text: str):
+        n = self.NGRAM
+        for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array('I')
+            postings.append(doc_id)
+
+    def substring(self, query: str) -> List[int]:
+        """Doc ids whose value contains `query` (lowercased), in insertion order."""
+        query = query.lower()
+        n = self.NGRAM
+        if len(query) < n:
+            return [i for i, text in enumerate(self.lower) if query in text]
+        if self.grams is None:
+            self.grams = {}
+            for doc_id, text in enumerate(self.lower):
+                self._add_grams(doc_id, text)
+        rarest = None
+        for i in range(len(query) - n + 1):
+            postings = self.grams.get(query[i:i + n])
+            if postings is None:
+                return []
+            if rarest is None or len(postings) < len(rarest):
+                rarest = postings
+        lower = self.lower
+        return [d for d in rarest if query in lower[d]]
+
+    def expand(self, term: str) -> List[str]:
+        """Vocabulary tokens equal to or starting with `term`."""
+        if not self._vocab_sorted:
+            self._vocab.sort()
+            self._vocab_sorted = True
+        start = bisect_left(self._vocab, term)
+        end = bisect_left(self._vocab, term + '\uffff')
+        return self._vocab[start:end]
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    In-memory title/author search index, built from the catalog on the first
+    search and extended incrementally as books are added after that.
+    """
+    FIELDS = ('title', 'author')
+
+    def __init__(self, books=()):
+        self.docs: List[Book] = []
+        self._fields = {field: _FieldIndex() for field in self.FIELDS}
+        for book in books:
+            self.add(book)
+
+    def add(self, book: Book):
+        doc_id = len(self.docs)
+        self.docs.append(book)
+        for field, index in self._fields.items():
+            index.add(doc_id, getattr(book, field))
+
+    def substring(self, field: str, query: str) -> List[Book]:
+        """Case-insensitive substring match on one field, in catalog order."""
+        return [self.docs[d] for d in self._fields[field].substring(query)]
+
+    def search(self, query: str, fields=FIELDS, limit: int = 20) -> List[Book]:
+        """
+        Ranked keyword search. Every query word must match a word in one of
+        `fields`, either exactly (scores 2) or as a prefix (scores 1). Results
+        are ordered by total score, then catalog order.
+        """
+        terms = _tokenize(query)
+        if not terms:
+            return []
+        scores: Dict[int, float] = {}
+        matched_terms: Dict[int, int] = {}
+        for term in terms:
+            best: Dict[int, float] = {}
+            for field in fields:
+                index = self._fields[field]
+                for token in index.expand(term):
+                    weight = 2.0 if token == term else 1.0
+                    for d in index.tokens[token]:
+                        if best.get(d, 0.0) < weight:
+                            best[d] = weight
+            for d, weight in best.items():
+                scores[d] = scores.get(d, 0.0) + weight
+                matched_terms[d] = matched_terms.get(d, 0) + 1
+
+        hits = [d for d, count in matched_terms.items() if count == len(terms)]
+        top = heapq.nsmallest(limit, hits, key=lambda d: (-scores[d], d))
+        return [self.docs[d] for d in top]
+
+
+SORT_KEYS = {
+    'title': lambda book: book.title.lower(),
+    'author': lambda book: (book.author.lower(), book.title.lower()),
+    'isbn': lambda book: book.isbn,
+}
+
 
+def _sort_key(order_by: str):
+    try:
+        return SORT_KEYS[order_by]
+    except KeyError:
+        raise ValueError(f"Unknown sort order: {order_by!r} (expected one of {', '.join(SORT_KEYS)})") from None
 
 
-class LibraryInventory:
+class SortedView:
+    """
+    The catalog ordered by one of SORT_KEYS, with catalog position as the final
+    tie-breaker; `keys` holds the matching (sort key, position) pairs. Built with
+    one stable sort on first use, then kept sorted as books are added: a few new
+    books are bisect-inserted, a large batch is merged in with one sort of the
+    two already-sorted runs.
+    """
+    MERGE_THRESHOLD = 64
+
+    def __init__(self, key):
+        self.key = key
+        self.keys: Optional[list] = None
+        self.books: Optional[List[Book]] = None
+        self._pending: list = []
+
+    def build(self, books: List[Book]):
+        # Sort positions on the plain key; stability keeps equal keys in catalog order.
+        keys = [self.key(book) for book in books]
+        order = sorted(range(len(books)), key=keys.__getitem__)
+        self.keys = [(keys[i], i) for i in order]
+        self.books = [books[i] for i in order]
+        self._pending = []
+
+    def add(self, book: Book, seq: int):
+        if self.keys is not None:
+            self._pending.append(((self.key(book), seq), book))
+
+    def flush(self):
+        pending = self._pending
+        if not pending:
+            return
+        if len(pending) < self.MERGE_THRESHOLD:
+            for k, book in pending:
+                i = bisect_right(self.keys, k)
+                self.keys.insert(i, k)
+                self.books.insert(i, book)
+        else:
+            keys = self.keys + [k for k, _ in pending]
+            books = self.books + [book for _, book in pending]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self.keys = [keys[i] for i in order]
+            self.books = [books[i] for i in order]
+        self._pending = []
+
+
+class CirculationLog:
+    """
+    Append-only history of issue/return events ('<catalog>.history', JSON lines)
+    with aggregates kept up to date as events are recorded: per-ISBN borrow
+    counts, current loans with their issue times, and loan-duration statistics
+    (Welford running mean/variance, min/max). Issue times are also kept in
+    time order in compact arrays, so a time-window query bisects to the window
+    and only counts the events inside it.
+
+    Appends are fsynced like the catalog journal (per event, or at sync() when
+    auto_sync is off). The aggregates are checkpointed to '<history>.ckpt'
+    together with the byte offset they cover, so loading reads the checkpoint
+    and replays only the events after it. A checkpoint is written once the
+    unreplayed tail reaches `checkpoint_bytes` (checked on catalog compaction
+    and on close). Nothing is read until the first query.
+    """
+    CHECKPOINT_VERSION = 1
+
+    def __init__(self, path: Union[str, Path], checkpoint_bytes: int = HISTORY_CHECKPOINT_BYTES):
+        self.path = Path(path)
+        self.checkpoint_file = self.path.with_name(self.path.name + '.ckpt')
+        self.checkpoint_bytes = checkpoint_bytes
+        self._file = None
+        self._loaded = False
+        self._offset = 0              # bytes of the history file folded into the aggregates
+        self._checkpoint_offset = 0   # bytes covered by the checkpoint on disk
+        self._reset()
+
+    def _reset(self):
+        self.borrow_counts: Dict[str, int] = {}
+        self.open_loans: Dict[str, float] = {}
+        self._loan_total: Dict[str, list] = {}   # isbn -> [loans returned, total seconds]
+        self._loans = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = float('inf')
+        self._max = 0.0
+        self._isbn_ids: Dict[str, int] = {}
+        self._isbns: List[str] = []
+        self._issue_times = array('d')
+        self._issue_ids = array('I')
+        self._offset = 0
+
+    def _apply(self, op: str, isbn: str, at: float):
+        if op == 'issue':
+            self.borrow_counts[isbn] = self.borrow_counts.get(isbn, 0) + 1
+            self.open_loans[isbn] = at
+            isbn_id = self._isbn_ids.get(isbn)
+            if isbn_id is None:
+                isbn_id = self._isbn_ids[isbn] = len(self._isbns)
+                self._isbns.append(isbn)
+            if self._issue_times and at < self._issue_times[-1]:
+                at = self._issue_times[-1]   # keep the array sorted if the clock stepped back
+            self._issue_times.append(at)
+            self._issue_ids.append(isbn_id)
+        elif op == 'return':
+            issued_at = self.open_loans.pop(isbn, None)
+            if issued_at is None:
+                return
+            duration = max(at - issued_at, 0.0)
+            self._loans += 1
+            delta = duration - self._mean
+            self._mean += delta / self._loans
+            self._m2 += delta * (duration - self._mean)
+            self._min = min(self._min, duration)
+            self._max = max(self._max, duration)
+            per_title = self._loan_total.setdefault(isbn, [0, 0.0])
+            per_title[0] += 1
+            per_title[1] += duration
+
+    def _head(self, size: int = 64) -> bytes:
+        """First bytes of the history file; ties a checkpoint to the file it was taken from."""
+        with self.path.open('rb') as f:
+            return f.read(size)
+
+    def _read_checkpoint_header(self) -> Optional[dict]:
+        try:
+            with self.checkpoint_file.open('rb') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        if header.get('version') != self.CHECKPOINT_VERSION:
+            return None
+        try:
+            if header['offset'] > self.path.stat().st_size or self._head().hex() != header['head']:
+                return None   # the history file was replaced or truncated since
+        except OSError:
+            return None
+        return header
+
+    def _restore_checkpoint(self) -> bool:
+        if self._read_checkpoint_header() is None:
+            return False
+        try:
+            with self.checkpoint_file.open('rb') as f:
+                header = json.loads(f.readline())
+                body = json.loads(f.readline())
+            self.borrow_counts = body['borrow_counts']
+            self.open_loans = body['open_loans']
+            self._loan_total = body['loan_total']
+            self._loans, self._mean, self._m2, self._min, self._max = body['loan_stats']
+            self._isbns = body['isbns']
+            self._isbn_ids = {isbn: i for i, isbn in enumerate(self._isbns)}
+            self._issue_times = array('d', bytes.fromhex(body['issue_times']))
+            self._issue_ids = array('I', bytes.fromhex(body['issue_ids']))
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable history checkpoint %s", self.checkpoint_file)
+            self._reset()
+            return False
+        self._offset = self._checkpoint_offset = header['offset']
+        return True
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self._file is not None:
+            self._file.flush()
+        if not self.path.exists():
+            return
+        self._restore_checkpoint()
+        with self.path.open('rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break   # an append still in progress; picked up on the next load
+                self._offset += len(line)
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping unreadable history line in %s", self.path)
+                    continue
+                self._apply(event['op'], event['isbn'], event['t'])
+
+    def checkpoint(self):
+        """Writes the aggregates (and the history offset they cover) atomically to the checkpoint file."""
+        self._load()
+        if self._offset == self._checkpoint_offset or not self.path.exists():
+            return
+        self.sync()
+        header = {'version': self.CHECKPOINT_VERSION, 'offset': self._offset, 'head': self._head().hex()}
+        body = {
+            'borrow_counts': self.borrow_counts,
+            'open_loans': self.open_loans,
+            'loan_total': self._loan_total,
+            'loan_stats': [self._loans, self._mean, self._m2, self._min, self._max],
+            'isbns': self._isbns,
+            'issue_times': self._issue_times.tobytes().hex(),
+            'issue_ids': self._issue_ids.tobytes().hex(),
+        }
+        tmp_file = self.checkpoint_file.with_name(self.checkpoint_file.name + '.tmp')
+        with tmp_file.open('w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + '\n')
+            f.write(json.dumps(body, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.checkpoint_file)
+        _fsync_directory(self.checkpoint_file.parent)
+        self._checkpoint_offset = self._offset
+
+    def maybe_checkpoint(self):
+        """Checkpoints once the history holds at least `checkpoint_bytes` not covered by the last checkpoint."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if self._loaded:
+            covered = self._checkpoint_offset
+        else:
+            header = self._read_checkpoint_header()
+            covered = header['offset'] if header else 0
+        if size - covered >= self.checkpoint_bytes:
+            self.checkpoint()
+
+    def _open_for_append(self):
+        created = not self.path.exists()
+        self._file = self.path.open('ab')
+        if created:
+            _fsync_directory(self.path.parent)
+            return
+        # Cut off a torn last line from a crash mid-append so the next event starts on its own line.
+        with self.path.open('rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    f.seek(max(end - 65536, 0))
+                    tail = f.read()
+                    cut = tail.rfind(b'\n')
+                    keep = end - len(tail) + cut + 1 if cut >= 0 else 0
+                    logger.warning("Discarding incomplete trailing history entry in %s", self.path)
+                    self._file.truncate(keep)
+
+    def record(self, op: str, isbn: str, at: Optional[float] = None, sync: bool = True):
+        """Appends one 'issue'/'return' event (timestamped now unless `at` is given); fsynced unless `sync` is False."""
+        at = time.time() if at is None else at
+        if self._file is None:
+            self._open_for_append()
+        line = (json.dumps({'t': at, 'op': op, 'isbn': isbn}, separators=(',', ':')) + '\n').encode('utf-8')
+        self._file.write(line)
+        if sync:
+            self.sync()
+        if self._loaded:
+            self._apply(op, isbn, at)
+            self._offset += len(line)
+
+    def sync(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def copy_to(self, target: 'CirculationLog') -> bool:
+        """
+        Copies this history and its checkpoint to `target`'s paths (temp file,
+        fsync, rename each), e.g. when the catalog moves to another backend.
+        Copies nothing and returns False when there is no history here or the
+        target already has history of its own.
+        """
+        self.sync()
+        if not self.path.exists() or not self.path.stat().st_size:
+            return False
+        if target.path.exists() and target.path.stat().st_size:
+            return False
+        for source, destination in ((self.path, target.path), (self.checkpoint_file, target.checkpoint_file)):
+            if not source.exists():
+                destination.unlink(missing_ok=True)   # a stale checkpoint must not describe the copied history
+                continue
+            tmp_file = destination.with_name(destination.name + '.tmp')
+            shutil.copyfile(source, tmp_file)
+            with tmp_file.open('rb+') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_file, destination)
+        _fsync_directory(target.path.parent)
+        target._loaded = False
+        target._reset()
+        target._checkpoint_offset = 0
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+        try:
+            self.maybe_checkpoint()
+        except OSError as e:
+            logger.error("Failed to checkpoint circulation history: %s", e, exc_info=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def top_borrowed(self, n: int = TOP_N, since: Optional[float] = None,
+                     until: Optional[float] = None) -> List[tuple]:
+        """The `n` most-issued ISBNs as (isbn, count), overall or for issues in [since, until)."""
+        self._load()
+        if since is None and until is None:
+            counts = self.borrow_counts
+        else:
+            start = bisect_left(self._issue_times, since) if since is not None else 0
+            end = bisect_left(self._issue_times, until) if until is not None else len(self._issue_times)
+            window: Dict[int, int] = {}
+            for isbn_id in self._issue_ids[start:end]:
+                window[isbn_id] = window.get(isbn_id, 0) + 1
+            counts = {self._isbns[isbn_id]: count for isbn_id, count in window.items()}
+        return heapq.nlargest(n, counts.items(), key=lambda item: item[1])
+
+    def issues_between(self, since: Optional[float] = None, until: Optional[float] = None) -> int:
+        self._load()
+        start = bisect_left(self._issue_times, since) if since is not None else 0
+        end = bisect_left(self._issue_times, until) if until is not None else len(self._issue_times)
+        return max(end - start, 0)
+
+    def current_loans(self) -> Dict[str, float]:
+        """ISBN -> issue timestamp for every loan not yet returned."""
+        self._load()
+        return dict(self.open_loans)
+
+    def loan_stats(self, isbn: Optional[str] = None) -> dict:
+        """Loan durations in seconds for returned loans: count, mean, stdev, min, max (overall) or count/mean for one ISBN."""
+        self._load()
+        if isbn is not None:
+            count, total = self._loan_total.get(isbn, (0, 0.0))
+            return {'count': count, 'mean': total / count if count else 0.0}
+        if not self._loans:
+            return {'count': 0, 'mean': 0.0, 'stdev': 0.0, 'min': 0.0, 'max': 0.0}
+        stdev = (self._m2 / (self._loans - 1)) ** 0.5 if self._loans > 1 else 0.0
+        return {'count': self._loans, 'mean': self._mean, 'stdev': stdev, 'min': self._min, 'max': self._max}
+
+
+class InventoryBackend(ABC):
+    """
+    Storage-independent interface used by LibraryCLI. LibraryInventory keeps the
+    catalog in memory on top of a JSON snapshot; SqliteInventory reads and
+    writes only the rows each operation needs.
+    """
+    @abstractmethod
+    def add_book(self, book: Book) -> bool: ...
+
+    @abstractmethod
+    def issue_book(self, isbn: str) -> bool: ...
+
+    @abstractmethod
+    def return_book(self, isbn: str) -> bool: ...
+
+    @abstractmethod
+    def search_by_isbn(self, isbn: str) -> Optional[Book]: ...
+
+    @abstractmethod
+    def search_by_title(self, title: str) -> List[Book]: ...
+
+    @abstractmethod
+    def search_by_author(self, author: str) -> List[Book]: ...
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20) -> List[Book]: ...
+
+    @abstractmethod
+    def display_all(self) -> List[Book]: ...
+
+    def add_books(self, books) -> int:
+        """Adds many books with one persistence write, skipping duplicate ISBNs. Returns the number added."""
+        return sum(self.add_book(book) for book in books)
+
+    def existing_isbns(self, isbns) -> set:
+        """The subset of `isbns` already in the catalog."""
+        return {isbn for isbn in isbns if self.search_by_isbn(isbn) is not None}
+
+    def iter_books(self):
+        """Iterates over the catalog in insertion order."""
+        return iter(self.display_all())
+
+    def books_with_status(self, status) -> List[Book]:
+        """All books currently in `status` ('available'/'issued' or a BookStatus)."""
+        status = BookStatus.parse(status)
+        return [book for book in self.iter_books() if book._status is status]
+
+    def available_books(self) -> List[Book]:
+        return self.books_with_status(BookStatus.AVAILABLE)
+
+    def count(self) -> int:
+        return len(self.display_all())
+
+    def page(self, order_by: str = 'title', number: int = 1, size: int = PAGE_SIZE) -> List[Book]:
+        """Page `number` (1-based) of the catalog sorted by `order_by` ('title', 'author' or 'isbn')."""
+        key = _sort_key(order_by)
+        start = max(number - 1, 0) * size
+        return sorted(self.display_all(), key=key)[start:start + size]
+
+    def browse(self, order_by: str = 'title', after: Optional[tuple] = None,
+               limit: int = PAGE_SIZE) -> tuple:
+        """
+        Cursor-based listing: up to `limit` books sorted by `order_by` that come
+        after the opaque cursor `after` (None starts at the beginning). Returns
+        (books, next_cursor); next_cursor is None on the last page.
+        """
+        key = _sort_key(order_by)
+        entries = sorted(((key(book), seq), book) for seq, book in enumerate(self.display_all()))
+        start = bisect_right([k for k, _ in entries], after) if after is not None else 0
+        chunk = entries[start:start + limit]
+        next_cursor = chunk[-1][0] if chunk and start + limit < len(entries) else None
+        return [book for _, book in chunk], next_cursor
+
+    # Circulation history; each backend attaches one next to its catalog file.
+    history: Optional[CirculationLog] = None
+
+    def _log_circulation(self, op: str, isbn: str):
+        if self.history is not None:
+            self.history.record(op, isbn, sync=self.auto_sync)
+
+    # When False, mutations are only made durable by an explicit sync() call, so
+    # a server can group-commit many operations behind a single fsync/commit.
+    auto_sync = True
+
+    def sync(self):
+        """Makes every completed mutation durable (needed only when auto_sync is False)."""
+
+    def save_catalog(self):
+        """Flushes any buffered state to storage."""
+
+    def close(self):
+        """Persists outstanding changes and releases the storage."""
+
+
+def _fsync_directory(path: Path):
+    """Makes renames/creations inside `path` durable (no-op where directories cannot be opened, e.g. Windows)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CatalogLockedError(RuntimeError):
+    """Raised when another process already has the catalog open."""
+
+
+def _lock_catalog(data_file: Path):
+    """
+    Takes an exclusive, non-blocking lock on '<data_file>.lock' and returns the
+    open lock file (closing it releases the lock). The holder's PID is written
+    into it for the error message. The OS drops the lock if the process dies.
+    """
+    lock_path = data_file.with_name(data_file.name + '.lock')
+    lock_file = lock_path.open('a+', encoding='utf-8')
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.seek(0)
+        holder = lock_file.read().strip() or 'unknown'
+        lock_file.close()
+        raise CatalogLockedError(
+            f"{data_file} is already open in another process (PID {holder}, lock {lock_path}). "
+            f"Close it first, or share the catalog through --serve.") from None
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+class LibraryInventory(InventoryBackend):
     """
     Manages the collection of Book objects and handles file persistence with JSON[cite: 22, 26].
+
+    In journaled mode (the default) the JSON file is a compact snapshot and every
+    add/issue/return is appended to '<data_file>.journal' and fsynced. The journal
+    is replayed on load and folded into a new snapshot once it holds
+    `compact_threshold` events, or whenever save_catalog() is called.
+
+    The catalog belongs to one process at a time: opening it takes an exclusive
+    lock on '<data_file>.lock' (CatalogLockedError if it is held) until close().
     """
-    def __init__(self, data_file: str = 'book_catalog.json'):
-        self.books: List[Book] = []
+    def __init__(self, data_file: str = 'book_catalog.json', journaled: bool = True,
+                 compact_threshold: int = JOURNAL_COMPACT_THRESHOLD):
         self.data_file = Path(data_file) 
+        self._lock = _lock_catalog(self.data_file)
+        self.books: List[Book] = []
+        # Snapshot entries that could not be turned into a Book; written back verbatim on save.
+        self._unreadable: List[dict] = []
+        self._isbn_index: Dict[str, Book] = {}
+        self._status_index: Dict[BookStatus, Dict[str, Book]] = {status: {} for status in BookStatus}
+        self._search: Optional[SearchIndex] = None
+        self._views = {order_by: SortedView(key) for order_by, key in SORT_KEYS.items()}
+        self.journal_file = self.data_file.with_name(self.data_file.name + '.journal')
+        self.history = CirculationLog(self.data_file.with_name(self.data_file.name + '.history'))
+        self.journaled = journaled
+        self.compact_threshold = compact_threshold
+        self._journal = None
+        self._journal_entries = 0
+        self._unsynced = False
         self._load_catalog()
+        if self.journaled:
+            self._replay_journal()
+
+    def _rebuild_index(self):
+        """Rebuilds the ISBN -> Book index (first occurrence wins) from self.books and drops the derived indexes."""
+        self._isbn_index = {}
+        for book in self.books:
+            self._isbn_index.setdefault(book.isbn, book)
+        self._status_index = {status: {} for status in BookStatus}
+        for isbn, book in self._isbn_index.items():
+            self._status_index[book._status][isbn] = book
+        self._search = None
+        self._views = {order_by: SortedView(key) for order_by, key in SORT_KEYS.items()}
+
+    def _index_book(self, book: Book):
+        """Adds a newly appended book to every index."""
+        self._isbn_index[book.isbn] = book
+        self._status_index[book._status][book.isbn] = book
+        if self._search is not None:
+            self._search.add(book)
+        seq = len(self.books) - 1
+        for view in self._views.values():
+            view.add(book, seq)
+
+    def _reindex_status(self, book: Book, previous: BookStatus):
+        if book._status is not previous:
+            self._status_index[previous].pop(book.isbn, None)
+            self._status_index[book._status][book.isbn] = book
 
     def _load_catalog(self):
         """
@@ -79,7 +957,17 @@ class LibraryInventory:
             if self.data_file.exists(): 
                 with self.data_file.open('r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.books = [Book(**book_dict) for book_dict in data] 
+                self.books = []
+                self._unreadable = []
+                for position, book_dict in enumerate(data):
+                    try:
+                        self.books.append(Book(**book_dict))
+                    except Exception as e:
+                        # Skip only this entry (kept for the next snapshot); the rest of the catalog still loads.
+                        logger.error("Skipping unreadable catalog entry #%d in %s: %s (%r)",
+                                     position, self.data_file, e, book_dict)
+                        self._unreadable.append(book_dict)
+                self._rebuild_index()
                 logger.info("Catalog loaded successfully from %s", self.data_file)
             else:
                 
@@ -87,50 +975,823 @@ class LibraryInventory:
         except json.JSONDecodeError:
             logger.error("Catalog file is corrupted (JSONDecodeError). Starting with an empty inventory.", exc_info=True)
             self.books = []
+            self._rebuild_index()
         except Exception as e:
             logger.error("An unexpected error occurred while loading the catalog: %s", e, exc_info=True)
             self.books = []
+            self._rebuild_index()
+
+    def _replay_journal(self):
+        """
+        Applies journal events on top of the snapshot. Events are idempotent, so
+        replaying a journal that was already folded into the snapshot is harmless.
+        A torn last line (crash mid-append) is cut off.
+        """
+        if not self.journal_file.exists():
+            return
+        try:
+            with self.journal_file.open('rb') as f:
+                raw = f.read()
+            complete = raw[:raw.rfind(b'\n') + 1]
+            if len(complete) != len(raw):
+                logger.warning("Discarding incomplete trailing journal entry in %s", self.journal_file)
+                with self.journal_file.open('r+b') as f:
+                    f.truncate(len(complete))
+            for line in complete.decode('utf-8').splitlines():
+                if line.strip():
+                    self._apply_event(json.loads(line))
+                    self._journal_entries += 1
+            logger.info("Replayed %d journal entries from %s", self._journal_entries, self.journal_file)
+        except Exception as e:
+            logger.error("Failed to replay journal %s: %s", self.journal_file, e, exc_info=True)
+            raise
+
+    def _apply_event(self, event: dict):
+        if event['op'] in ('add', 'add_many'):
+            book_dicts = [event['book']] if event['op'] == 'add' else event['books']
+            for book_dict in book_dicts:
+                book = Book(**book_dict)
+                if book.isbn not in self._isbn_index:
+                    self.books.append(book)
+                    self._index_book(book)
+        elif event['op'] == 'status':
+            book = self._isbn_index.get(event['isbn'])
+            if book is not None:
+                previous = book._status
+                book.status = event['status']
+                self._reindex_status(book, previous)
+
+    def _record(self, event: dict):
+        """Persists one mutation: a journal append in journaled mode, a full save otherwise."""
+        if not self.journaled:
+            if self.auto_sync:
+                self.save_catalog()
+            else:
+                self._unsynced = True
+            return
+        try:
+            if self._journal is None:
+                created = not self.journal_file.exists()
+                self._journal = self.journal_file.open('a', encoding='utf-8')
+                if created:
+                    _fsync_directory(self.journal_file.parent)
+            self._journal.write(json.dumps(event, separators=(',', ':')) + '\n')
+            if self.auto_sync:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            else:
+                self._unsynced = True
+        except Exception as e:
+            logger.error("Failed to append to journal: %s", e, exc_info=True)
+            raise
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_threshold:
+            self.save_catalog()
 
     def save_catalog(self):
-        """Saves the current book catalog to the JSON file."""
+        """
+        Writes a full snapshot of the catalog (atomically: temp file, fsync, rename)
+        and then empties the journal.
+        """
         try: 
-            data = [book.to_dict() for book in self.books]
-            with self.data_file.open('w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            data = [book.to_dict() for book in self.books] + self._unreadable
+            tmp_file = self.data_file.with_name(self.data_file.name + '.tmp')
+            with tmp_file.open('w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            # The rename must be durable before the journal is emptied, or a power loss
+            # could bring back the old snapshot next to an already-truncated journal.
+            _fsync_directory(self.data_file.parent)
+            if self.journaled:
+                self._truncate_journal()
+            self._unsynced = False
+            self.history.maybe_checkpoint()
             logger.info("Catalog saved successfully to %s", self.data_file)
         except Exception as e:
             logger.error("Failed to save catalog: %s", e, exc_info=True)
             raise 
 
+    def sync(self):
+        """Flushes and fsyncs journal writes made with auto_sync disabled."""
+        self.history.sync()
+        if not self._unsynced:
+            return
+        if not self.journaled:
+            self.save_catalog()
+        elif self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        self._unsynced = False
+
+    def _truncate_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with self.journal_file.open('w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries = 0
+
+    def close(self):
+        """Folds the journal into the snapshot, releases the journal file and the catalog lock."""
+        try:
+            if self._unsynced or (self.journaled and self._journal_entries):
+                self.save_catalog()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self.history.close()
+        finally:
+            self._lock.close()
+
     def add_book(self, book: Book) -> bool:
         """Adds a Book object to the inventory. Checks for existing ISBN."""
-        if any(b.isbn == book.isbn for b in self.books):
+        if book.isbn in self._isbn_index:
             logger.warning("Attempted to add a book with duplicate ISBN: %s", book.isbn)
             return False
         self.books.append(book)
-        self.save_catalog()
+        self._index_book(book)
+        self._record({'op': 'add', 'book': book.to_dict()})
+        return True
+
+    def add_books(self, books) -> int:
+        """Adds many books as a single journal event (or a single save), skipping duplicate ISBNs."""
+        added = []
+        for book in books:
+            if book.isbn in self._isbn_index:
+                continue
+            self.books.append(book)
+            self._index_book(book)
+            added.append(book)
+        if added:
+            self._record({'op': 'add_many', 'books': [book.to_dict() for book in added]})
+        return len(added)
+
+    def existing_isbns(self, isbns) -> set:
+        return {isbn for isbn in isbns if isbn in self._isbn_index}
+
+    def books_with_status(self, status) -> List[Book]:
+        """
+        Served from the status index, no catalog scan. Status changes made by
+        calling Book.issue()/return_book() directly bypass the index; the
+        inventory's issue_book/return_book keep it current.
+        """
+        status = BookStatus.parse(status)
+        return [book for book in self._status_index[status].values() if book._status is status]
+
+    def count_by_status(self) -> Dict[str, int]:
+        return {status.label: len(books) for status, books in self._status_index.items()}
+
+    def iter_books(self):
+        return iter(self.books)
+
+    def _search_index(self) -> SearchIndex:
+        # Built on the first search; loads for import/export/serve/stats never pay for it.
+        if self._search is None:
+            self._search = SearchIndex(self.books)
+        return self._search
+
+    def _view(self, order_by: str) -> SortedView:
+        _sort_key(order_by)
+        view = self._views[order_by]
+        if view.keys is None:
+            view.build(self.books)
+        else:
+            view.flush()
+        return view
+
+    def count(self) -> int:
+        return len(self.books)
+
+    def page(self, order_by: str = 'title', number: int = 1, size: int = PAGE_SIZE) -> List[Book]:
+        """Served from the maintained sorted view: a slice, no sort."""
+        start = max(number - 1, 0) * size
+        return self._view(order_by).books[start:start + size]
+
+    def browse(self, order_by: str = 'title', after: Optional[tuple] = None,
+               limit: int = PAGE_SIZE) -> tuple:
+        view = self._view(order_by)
+        start = bisect_right(view.keys, after) if after is not None else 0
+        books = view.books[start:start + limit]
+        next_cursor = view.keys[start + len(books) - 1] if books and start + limit < len(view.keys) else None
+        return books, next_cursor
+
+    def issue_book(self, isbn: str) -> bool:
+        """Issues the book with this ISBN if it exists and is available, and persists the change."""
+        book = self._isbn_index.get(isbn)
+        if book is None or not book.issue():
+            return False
+        self._reindex_status(book, BookStatus.AVAILABLE)
+        self._record({'op': 'status', 'isbn': isbn, 'status': book.status})
+        self._log_circulation('issue', isbn)
+        return True
+
+    def return_book(self, isbn: str) -> bool:
+        """Returns the book with this ISBN if it exists and is issued, and persists the change."""
+        book = self._isbn_index.get(isbn)
+        if book is None or not book.return_book():
+            return False
+        self._reindex_status(book, BookStatus.ISSUED)
+        self._record({'op': 'status', 'isbn': isbn, 'status': book.status})
+        self._log_circulation('return', isbn)
         return True
 
     def search_by_title(self, title: str) -> List[Book]:
         """Searches for books whose title contains the search string (case-insensitive)."""
-        search_term = title.lower()
-        return [book for book in self.books if search_term in book.title.lower()]
+        return self._search_index().substring('title', title)
+
+    def search_by_author(self, author: str) -> List[Book]:
+        """Searches for books whose author contains the search string (case-insensitive)."""
+        return self._search_index().substring('author', author)
+
+    def search(self, query: str, limit: int = 20) -> List[Book]:
+        """Ranked keyword search over titles and authors with prefix matching."""
+        return self._search_index().search(query, limit=limit)
 
     def search_by_isbn(self, isbn: str) -> Optional[Book]:
         """Searches for a single book matching the exact ISBN."""
-        return next((book for book in self.books if book.isbn == isbn), None)
+        return self._isbn_index.get(isbn)
 
     def display_all(self):
         """Returns the entire list of books."""
         return self.books
 
 
+class SqliteInventory(InventoryBackend):
+    """
+    SQLite-backed catalog (standard library only). Rows are read on demand, so
+    startup cost does not depend on catalog size. ISBN is the primary key,
+    title/author/status are indexed, the database runs in WAL mode, and issue/return
+    are single conditional UPDATEs inside a transaction.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            isbn TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'available',
+            title_lower TEXT NOT NULL,
+            author_lower TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_books_title ON books(title_lower);
+        CREATE INDEX IF NOT EXISTS idx_books_author ON books(author_lower);
+        CREATE INDEX IF NOT EXISTS idx_books_status ON books(status);
+        CREATE INDEX IF NOT EXISTS idx_books_author_title ON books(author_lower, title_lower);
+    """
+    COLUMNS = "title, author, isbn, status"
+    ORDER_COLUMNS = {'title': ('title_lower',), 'author': ('author_lower', 'title_lower'), 'isbn': ('isbn',)}
+
+    def __init__(self, db_file: str = 'book_catalog.db'):
+        self.db_file = Path(db_file)
+        self.history = CirculationLog(self.db_file.with_name(self.db_file.name + '.history'))
+        try:
+            self.conn = sqlite3.connect(str(self.db_file))
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(self.SCHEMA)
+            logger.info("SQLite catalog opened: %s", self.db_file)
+        except sqlite3.Error as e:
+            logger.error("Failed to open SQLite catalog %s: %s", self.db_file, e, exc_info=True)
+            raise
+
+    @staticmethod
+    def _book(row) -> Book:
+        return Book(*row)
+
+    def _query(self, sql: str, params=()) -> List[Book]:
+        return [self._book(row) for row in self.conn.execute(sql, params)]
+
+    def _commit(self):
+        if self.auto_sync:
+            self.conn.commit()
+
+    def sync(self):
+        self.conn.commit()
+        self.history.sync()
+
+    def add_book(self, book: Book) -> bool:
+        """Adds a Book object to the inventory. Checks for existing ISBN."""
+        try:
+            self.conn.execute(
+                "INSERT INTO books (title, author, isbn, status, title_lower, author_lower) VALUES (?, ?, ?, ?, ?, ?)",
+                (book.title, book.author, book.isbn, book.status, book.title.lower(), book.author.lower()))
+            self._commit()
+            return True
+        except sqlite3.IntegrityError:
+            logger.warning("Attempted to add a book with duplicate ISBN: %s", book.isbn)
+            return False
+
+    def add_books(self, books) -> int:
+        """Inserts many books in one transaction, skipping duplicate ISBNs. Returns the number added."""
+        before = self.conn.total_changes
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO books (title, author, isbn, status, title_lower, author_lower) VALUES (?, ?, ?, ?, ?, ?)",
+                ((b.title, b.author, b.isbn, b.status, b.title.lower(), b.author.lower()) for b in books))
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        self._commit()
+        return self.conn.total_changes - before
+
+    def existing_isbns(self, isbns) -> set:
+        isbns = list(isbns)
+        found = set()
+        for i in range(0, len(isbns), 500):
+            chunk = isbns[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(row[0] for row in self.conn.execute(f"SELECT isbn FROM books WHERE isbn IN ({marks})", chunk))
+        return found
+
+    def iter_books(self):
+        """Streams rows from a cursor instead of materialising the catalog."""
+        for row in self.conn.execute(f"SELECT {self.COLUMNS} FROM books ORDER BY rowid"):
+            yield self._book(row)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def _order_columns(self, order_by: str) -> tuple:
+        _sort_key(order_by)
+        return self.ORDER_COLUMNS[order_by] + ('rowid',)
+
+    def page(self, order_by: str = 'title', number: int = 1, size: int = PAGE_SIZE) -> List[Book]:
+        order = ', '.join(self._order_columns(order_by))
+        return self._query(f"SELECT {self.COLUMNS} FROM books ORDER BY {order} LIMIT ? OFFSET ?",
+                           (size, max(number - 1, 0) * size))
+
+    def browse(self, order_by: str = 'title', after: Optional[tuple] = None,
+               limit: int = PAGE_SIZE) -> tuple:
+        """Keyset pagination over the matching index; the cursor is the last row's sort key and rowid."""
+        columns = self._order_columns(order_by)
+        order = ', '.join(columns)
+        where, params = '', ()
+        if after is not None:
+            where = f"WHERE ({order}) > ({', '.join('?' * len(columns))})"
+            params = tuple(after)
+        rows = self.conn.execute(f"SELECT {self.COLUMNS}, {order} FROM books {where} ORDER BY {order} LIMIT ?",
+                                 params + (limit + 1,)).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        books = [self._book(row[:4]) for row in rows]
+        next_cursor = tuple(rows[-1][4:]) if rows and has_more else None
+        return books, next_cursor
+
+    def books_with_status(self, status) -> List[Book]:
+        status = BookStatus.parse(status)
+        if status is BookStatus.OTHER:
+            return self._query(f"SELECT {self.COLUMNS} FROM books WHERE status NOT IN (?, ?) ORDER BY rowid",
+                               (BookStatus.AVAILABLE.label, BookStatus.ISSUED.label))
+        return self._query(f"SELECT {self.COLUMNS} FROM books WHERE status = ? ORDER BY rowid", (status.label,))
+
+    def count_by_status(self) -> Dict[str, int]:
+        counts = {status.label: 0 for status in BookStatus}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM books GROUP BY status"):
+            label = status if status in counts else BookStatus.OTHER.label
+            counts[label] += count
+        return counts
+
+    def _set_status(self, isbn: str, current: str, new: str) -> bool:
+        cur = self.conn.execute("UPDATE books SET status = ? WHERE isbn = ? AND status = ?", (new, isbn, current))
+        self._commit()
+        return cur.rowcount == 1
+
+    def issue_book(self, isbn: str) -> bool:
+        """Issues the book with this ISBN if it exists and is available."""
+        if not self._set_status(isbn, 'available', 'issued'):
+            return False
+        self._log_circulation('issue', isbn)
+        return True
+
+    def return_book(self, isbn: str) -> bool:
+        """Returns the book with this ISBN if it exists and is issued."""
+        if not self._set_status(isbn, 'issued', 'available'):
+            return False
+        self._log_circulation('return', isbn)
+        return True
+
+    def search_by_isbn(self, isbn: str) -> Optional[Book]:
+        """Searches for a single book matching the exact ISBN."""
+        row = self.conn.execute(f"SELECT {self.COLUMNS} FROM books WHERE isbn = ?", (isbn,)).fetchone()
+        return self._book(row) if row else None
+
+    def search_by_title(self, title: str) -> List[Book]:
+        """Searches for books whose title contains the search string (case-insensitive)."""
+        return self._query(f"SELECT {self.COLUMNS} FROM books WHERE instr(title_lower, ?) > 0 ORDER BY rowid",
+                           (title.lower(),))
+
+    def search_by_author(self, author: str) -> List[Book]:
+        """Searches for books whose author contains the search string (case-insensitive)."""
+        return self._query(f"SELECT {self.COLUMNS} FROM books WHERE instr(author_lower, ?) > 0 ORDER BY rowid",
+                           (author.lower(),))
+
+    def search(self, query: str, limit: int = 20) -> List[Book]:
+        """
+        Ranked keyword search with the same scoring as SearchIndex: SQLite narrows
+        the rows to those containing every word, and the words are scored in Python.
+        """
+        terms = _tokenize(query)
+        if not terms:
+            return []
+        where = " AND ".join("instr(title_lower || ' ' || author_lower, ?) > 0" for _ in terms)
+        candidates = self._query(f"SELECT {self.COLUMNS} FROM books WHERE {where} ORDER BY rowid", terms)
+        scored = []
+        for pos, book in enumerate(candidates):
+            words = _tokenize(book.title) + _tokenize(book.author)
+            score = 0.0
+            for term in terms:
+                best = max((2.0 if w == term else 1.0 for w in words if w.startswith(term)), default=0.0)
+                if not best:
+                    break
+                score += best
+            else:
+                scored.append((-score, pos, book))
+        return [book for _, _, book in heapq.nsmallest(limit, scored)]
+
+    def display_all(self) -> List[Book]:
+        """Returns the entire list of books."""
+        return self._query(f"SELECT {self.COLUMNS} FROM books ORDER BY rowid")
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+        self.history.close()
+
+
+def migrate_json_to_sqlite(json_file: str, db_file: str) -> int:
+    """
+    One-shot migration of a JSON catalog (snapshot plus journal) into SQLite.
+    Books whose ISBN is already in the database are skipped. The circulation
+    history (and its checkpoint) is copied next to the database, unless the
+    database already has a history, which is then left untouched. Returns the
+    number of books added.
+    """
+    source = LibraryInventory(json_file)
+    target = SqliteInventory(db_file)
+    try:
+        added = target.add_books(source.display_all())
+        logger.info("Migrated %d of %d books from %s to %s", added, len(source.books), json_file, db_file)
+        if source.history.copy_to(target.history):
+            logger.info("Copied circulation history %s to %s", source.history.path, target.history.path)
+        elif source.history.path.exists() and source.history.path.stat().st_size:
+            logger.warning("Circulation history %s NOT migrated: %s already has a history",
+                           source.history.path, target.history.path)
+        return added
+    finally:
+        target.close()
+        source.close()
+
+
+class ImportReport:
+    """Outcome of import_catalog: counts plus (line number, reason) for each rejected row."""
+    def __init__(self):
+        self.added = 0
+        self.batches = 0
+        self.rejected: List[tuple] = []
+
+    def __str__(self):
+        return f"{self.added} books added in {self.batches} batches, {len(self.rejected)} rows rejected"
+
+
+def _read_catalog_rows(path: Path):
+    """Yields (line number, dict) from a CSV or JSON Lines file without reading it whole."""
+    with path.open('r', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, f"invalid JSON: {e.msg}"
+                    continue
+                yield line_no, row
+
+
+def _validate_row(row) -> Union[Book, str]:
+    """Returns a Book, or the reason the row is rejected."""
+    if not isinstance(row, dict):
+        return row if isinstance(row, str) else "not an object"
+    fields = {}
+    for key in ('title', 'author', 'isbn'):
+        value = row.get(key)
+        if not isinstance(value, str) or not value.strip():
+            return f"missing {key}"
+        fields[key] = value.strip()
+    try:
+        status = BookStatus.parse(row.get('status') or 'available')
+    except ValueError:
+        status = BookStatus.OTHER
+    if status is BookStatus.OTHER:
+        return f"invalid status '{row.get('status')}'"
+    return Book(status=status, **fields)
+
+
+def import_catalog(inventory: InventoryBackend, path: str, batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """
+    Streams a CSV (header: title,author,isbn[,status]) or JSON Lines file into the
+    inventory. Rows are validated, deduplicated by ISBN against the file and the
+    catalog, and committed in batches with one persistence write per batch.
+    """
+    path = Path(path)
+    report = ImportReport()
+    seen = set()
+    batch: List[tuple] = []
+
+    def flush():
+        existing = inventory.existing_isbns(book.isbn for _, book in batch)
+        fresh = []
+        for line_no, book in batch:
+            if book.isbn in existing:
+                report.rejected.append((line_no, f"duplicate ISBN {book.isbn} already in catalog"))
+            else:
+                fresh.append(book)
+        report.added += inventory.add_books(fresh)
+        report.batches += 1
+        batch.clear()
+
+    for line_no, row in _read_catalog_rows(path):
+        result = _validate_row(row)
+        if isinstance(result, str):
+            report.rejected.append((line_no, result))
+            continue
+        if result.isbn in seen:
+            report.rejected.append((line_no, f"duplicate ISBN {result.isbn} in file"))
+            continue
+        seen.add(result.isbn)
+        batch.append((line_no, result))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    logger.info("Import from %s: %s", path, report)
+    return report
+
+
+def export_catalog(inventory: InventoryBackend, path: str) -> int:
+    """Streams the catalog to CSV or JSON Lines (by extension), one book at a time. Returns the count."""
+    path = Path(path)
+    count = 0
+    with path.open('w', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            writer = csv.writer(f)
+            writer.writerow(['title', 'author', 'isbn', 'status'])
+            for book in inventory.iter_books():
+                writer.writerow([book.title, book.author, book.isbn, book.status])
+                count += 1
+        else:
+            for book in inventory.iter_books():
+                f.write(json.dumps(book.to_dict()) + '\n')
+                count += 1
+    logger.info("Exported %d books to %s", count, path)
+    return count
+
+
+def print_circulation_report(inventory: InventoryBackend, days: int = 30, n: int = TOP_N):
+    """Prints most-borrowed titles (all time and last `days` days), current loans and loan durations."""
+    history = inventory.history
+
+    def titled(rows):
+        for rank, (isbn, count) in enumerate(rows, 1):
+            book = inventory.search_by_isbn(isbn)
+            print(f"  {rank:2d}. {count:6d}  {book.title if book else '?'} ({isbn})")
+
+    print("--- Most borrowed (all time) ---")
+    titled(history.top_borrowed(n))
+    since = time.time() - days * SECONDS_PER_DAY
+    print(f"--- Most borrowed (last {days} days, {history.issues_between(since)} issues) ---")
+    titled(history.top_borrowed(n, since=since))
+    print(f"--- Currently on loan: {len(history.current_loans())} ---")
+    stats = history.loan_stats()
+    print(f"--- Loan duration over {stats['count']} returns (days) ---")
+    if stats['count']:
+        print(f"  mean {stats['mean'] / SECONDS_PER_DAY:.2f}  stdev {stats['stdev'] / SECONDS_PER_DAY:.2f}  "
+              f"min {stats['min'] / SECONDS_PER_DAY:.2f}  max {stats['max'] / SECONDS_PER_DAY:.2f}")
+
+
+def open_inventory(data_file: str) -> InventoryBackend:
+    """Picks the storage backend from the file extension (.db/.sqlite/.sqlite3 -> SQLite, else JSON)."""
+    if Path(data_file).suffix.lower() in SQLITE_SUFFIXES:
+        return SqliteInventory(data_file)
+    return LibraryInventory(data_file)
+
+
+class LibraryService:
+    """
+    asyncio JSON-lines service (TCP or Unix socket) that lets several circulation
+    desks share one inventory. Each request is one JSON object per line:
+        {"id": 1, "op": "issue", "isbn": "..."}    ops: ping, get, search, add, issue, return
+    and gets {"id": 1, "ok": true, "result": ...} back.
+
+    Operations on the same ISBN are serialized by a per-ISBN lock that is held
+    until the change is durable. Durability is group-committed: the inventory
+    runs with auto_sync off, and one sync() every `commit_interval` seconds
+    covers all operations completed since the previous one.
+    """
+    def __init__(self, inventory: InventoryBackend, commit_interval: float = SERVICE_COMMIT_INTERVAL):
+        self.inventory = inventory
+        self.inventory.auto_sync = False
+        self.commit_interval = commit_interval
+        self._locks: Dict[str, list] = {}  # isbn -> [lock, users]
+        self._waiters: List[asyncio.Future] = []
+        self._wake = None
+        self.operations = 0
+
+    @contextlib.asynccontextmanager
+    async def _isbn_lock(self, isbn: str):
+        entry = self._locks.setdefault(isbn, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[isbn]
+
+    async def _durable(self):
+        """Waits until the next group commit has synced the inventory."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._wake.set()
+        await future
+
+    async def _committer(self):
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(self.commit_interval)
+            self._wake.clear()
+            waiters, self._waiters = self._waiters, []
+            try:
+                self.inventory.sync()
+            except Exception as e:
+                logger.error("Group commit failed: %s", e, exc_info=True)
+                for future in waiters:
+                    future.set_exception(e)
+                continue
+            for future in waiters:
+                future.set_result(None)
+
+    async def _mutate(self, isbn: str, operation) -> bool:
+        async with self._isbn_lock(isbn):
+            ok = operation()
+            if ok:
+                await self._durable()
+            return ok
+
+    async def handle_request(self, request: dict):
+        op = request.get('op')
+        self.operations += 1
+        if op == 'ping':
+            return 'pong'
+        if op == 'get':
+            book = self.inventory.search_by_isbn(str(request['isbn']))
+            return book.to_dict() if book else None
+        if op == 'search':
+            return [b.to_dict() for b in self.inventory.search(str(request['query']), int(request.get('limit', 20)))]
+        if op == 'add':
+            book = Book(str(request['title']), str(request['author']), str(request['isbn']))
+            return await self._mutate(book.isbn, lambda: self.inventory.add_book(book))
+        if op == 'issue':
+            isbn = str(request['isbn'])
+            return await self._mutate(isbn, lambda: self.inventory.issue_book(isbn))
+        if op == 'return':
+            isbn = str(request['isbn'])
+            return await self._mutate(isbn, lambda: self.inventory.return_book(isbn))
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _respond(self, request: dict, writer, write_lock: asyncio.Lock):
+        try:
+            response = {'id': request.get('id'), 'ok': True, 'result': await self.handle_request(request)}
+        except Exception as e:
+            logger.warning("Request failed (%s): %s", request.get('op'), e)
+            response = {'id': request.get('id'), 'ok': False, 'error': str(e)}
+        async with write_lock:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+
+    async def _handle_client(self, reader, writer):
+        # requests on one connection may be pipelined; responses carry the request id
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    request = {'op': None, 'error': str(e)}
+                task = asyncio.create_task(self._respond(request, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, unix_socket: Optional[str] = None):
+        self._wake = asyncio.Event()
+        committer = asyncio.create_task(self._committer())
+        if unix_socket:
+            server = await asyncio.start_unix_server(self._handle_client, path=unix_socket)
+            where = unix_socket
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port)
+            where = f"{host}:{port}"
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # e.g. Windows: Ctrl+C still raises KeyboardInterrupt
+        logger.info("Library service listening on %s", where)
+        print(f"Library service listening on {where} (Ctrl+C to stop)")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            committer.cancel()
+            self.inventory.sync()
+            logger.info("Library service stopped")
+
+
+async def run_load_test(host: str = SERVICE_HOST, port: int = SERVICE_PORT, unix_socket: Optional[str] = None,
+                        clients: int = 50, requests_per_client: int = 2000, books: int = 1000) -> dict:
+    """
+    Drives a running LibraryService with `clients` concurrent connections, each
+    sending issue/return requests for random ISBNs one at a time. Prints and
+    returns throughput and latency percentiles.
+    """
+    async def connect():
+        if unix_socket:
+            return await asyncio.open_unix_connection(unix_socket)
+        return await asyncio.open_connection(host, port)
+
+    async def call(reader, writer, request):
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    reader, writer = await connect()
+    for i in range(books):
+        await call(reader, writer, {'id': i, 'op': 'add', 'title': f'Load Test {i}', 'author': 'Load Tester',
+                                    'isbn': f'LT-{i}'})
+    writer.close()
+
+    latencies: List[float] = []
+    successes = 0
+
+    async def client(n: int):
+        nonlocal successes
+        rng = random.Random(n)
+        reader, writer = await connect()
+        for i in range(requests_per_client):
+            request = {'id': i, 'op': rng.choice(('issue', 'return')), 'isbn': f'LT-{rng.randrange(books)}'}
+            start = time.perf_counter()
+            response = await call(reader, writer, request)
+            latencies.append(time.perf_counter() - start)
+            successes += bool(response.get('result'))
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    result = {
+        'operations': total,
+        'seconds': round(elapsed, 3),
+        'ops_per_sec': round(total / elapsed, 1),
+        'state_changes': successes,
+        'p50_ms': round(latencies[total // 2] * 1000, 2),
+        'p99_ms': round(latencies[min(total - 1, int(total * 0.99))] * 1000, 2),
+    }
+    print(f"{total} operations from {clients} clients in {elapsed:.2f}s: {result['ops_per_sec']} ops/sec "
+          f"(p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, {successes} state changes)")
+    return result
+
+
 class LibraryCLI:
     """
     Menu-Driven Command Line Interface for the Library Inventory Manager[cite: 30].
     """
     def __init__(self, data_file: str = 'book_catalog.json'):
-        self.inventory = LibraryInventory(data_file)
+        self.inventory = open_inventory(data_file)
 
     def _get_input(self, prompt: str, input_type=str, allow_empty: bool = False) -> Optional[str]:
         """
@@ -193,12 +1854,10 @@ class LibraryCLI:
             book = self.inventory.search_by_isbn(isbn)
 
             if book:
-                if operation == "issue" and book.issue():
-                    self.inventory.save_catalog()
-                    print(f"\n✅ Book issued successfully: {book.title} (Status: {book.status.upper()})")
-                elif operation == "return" and book.return_book():
-                    self.inventory.save_catalog()
-                    print(f"\n✅ Book returned successfully: {book.title} (Status: {book.status.upper()})")
+                if operation == "issue" and self.inventory.issue_book(isbn):
+                    print(f"\n✅ Book issued successfully: {book.title} (Status: ISSUED)")
+                elif operation == "return" and self.inventory.return_book(isbn):
+                    print(f"\n✅ Book returned successfully: {book.title} (Status: AVAILABLE)")
                 else:
                     print(f"\n⚠️ Action failed. Book is already {book.status}.")
                     logger.info("Action failed: Book already in desired state (%s)", book.status)
@@ -212,12 +1871,14 @@ class LibraryCLI:
 
 
     def search_books(self):
-        """Allows searching by title or ISBN."""
+        """Allows searching by title, ISBN, author or keywords."""
         print("\n--- Search Book ---")
         print("1. Search by Title")
         print("2. Search by ISBN")
+        print("3. Search by Author")
+        print("4. Keyword Search (title and author, best matches first)")
         
-        choice = self._get_input("Enter choice (1 or 2): ")
+        choice = self._get_input("Enter choice (1-4): ")
         if not choice:
             return
 
@@ -232,6 +1893,16 @@ class LibraryCLI:
                 if not isbn: return
                 book = self.inventory.search_by_isbn(isbn)
                 results = [book] if book else []
+
+            elif choice == '3':
+                search_term = self._get_input("Enter search term (part of author name): ")
+                if not search_term: return
+                results = self.inventory.search_by_author(search_term)
+
+            elif choice == '4':
+                search_term = self._get_input("Enter keywords (word beginnings are enough): ")
+                if not search_term: return
+                results = self.inventory.search(search_term)
                 
             else:
                 print("\n⚠️ Invalid search choice. Returning to main menu.")
@@ -253,13 +1924,36 @@ class LibraryCLI:
     def view_all_books(self):
         """Displays all books in the catalog."""
         print("\n--- Current Library Catalog ---")
-        books = self.inventory.display_all()
-        if books:
-            sorted_books = sorted(books, key=lambda b: b.title.lower())
-            for book in sorted_books:
-                print(book)
-        else:
+        total = self.inventory.count()
+        if not total:
             print("The library inventory is currently empty.")
+            return
+        order_by = 'title'
+        if total > PAGE_SIZE:
+            choice = self._get_input(f"Sort by ({'/'.join(SORT_KEYS)}) [title]: ", allow_empty=True)
+            if choice is None:
+                return
+            choice = choice.lower()
+            order_by = choice if choice in SORT_KEYS else 'title'
+        pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        number = 1
+        while True:
+            for book in self.inventory.page(order_by, number, PAGE_SIZE):
+                print(book)
+            if pages == 1:
+                return
+            choice = self._get_input(f"-- Page {number}/{pages} -- [n]ext, [p]revious, page number, or [q]uit: ", allow_empty=True)
+            if choice is None:
+                return
+            choice = choice.lower()
+            if choice in ('n', '') and number < pages:
+                number += 1
+            elif choice == 'p' and number > 1:
+                number -= 1
+            elif choice.isdigit() and 1 <= int(choice) <= pages:
+                number = int(choice)
+            elif choice in ('q', 'n', ''):
+                return
 
 
     def display_menu(self):
@@ -278,45 +1972,119 @@ class LibraryCLI:
 
     def run(self):
         """Main loop for the CLI."""
-        while True:
-            self.display_menu()
-            
-            choice = self._get_input("Enter your choice (1-6): ", allow_empty=True)
-            if not choice:
-                continue
+        try:
+            while True:
+                self.display_menu()
+                
+                choice = self._get_input("Enter your choice (1-6): ", allow_empty=True)
+                if not choice:
+                    continue
 
-            try: 
-                if choice == '1':
-                    self.add_book()
-                elif choice == '2':
-                    self.issue_return_book("issue")
-                elif choice == '3':
-                    self.issue_return_book("return")
-                elif choice == '4':
-                    self.view_all_books()
-                elif choice == '5':
-                    self.search_books()
-                elif choice == '6':
+                try: 
+                    if choice == '1':
+                        self.add_book()
+                    elif choice == '2':
+                        self.issue_return_book("issue")
+                    elif choice == '3':
+                        self.issue_return_book("return")
+                    elif choice == '4':
+                        self.view_all_books()
+                    elif choice == '5':
+                        self.search_books()
+                    elif choice == '6':
+                        break
+                    else:
+                        print("\n⚠️ Invalid choice. Please enter a number between 1 and 6.")
+                        logger.warning("Invalid menu choice: %s", choice)
+                
+                except Exception as e:
+                    print(f"\n❌ CRITICAL ERROR in application loop: {e}")
+                    logger.critical("Unhandled exception in main loop.", exc_info=True)
                     break
-                else:
-                    print("\n⚠️ Invalid choice. Please enter a number between 1 and 6.")
-                    logger.warning("Invalid menu choice: %s", choice)
-            
-            except Exception as e:
-                print(f"\n❌ CRITICAL ERROR in application loop: {e}")
-                logger.critical("Unhandled exception in main loop.", exc_info=True)
-                break
-            
-            finally: 
-                    try:
-                         self.inventory.save_catalog()
-                    except Exception:
-                        logger.error("Failed to save catalog during final shutdown.", exc_info=True)
-            
-            print("\n👋 Thank you for using the Library Inventory Manager. Exiting.")
-            logger.info("Application successfully exited.")
-
+        
+        finally: 
+            # every operation is already journaled; this only folds the journal into a fresh snapshot
+            try:
+                self.inventory.close()
+            except Exception:
+                logger.error("Failed to save catalog during final shutdown.", exc_info=True)
+        
+        print("\n👋 Thank you for using the Library Inventory Manager. Exiting.")
+        logger.info("Application successfully exited.")
 
 if __name__ == "__main__":
-    cli = LibraryCLI() 
-    cli.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Library Inventory Manager")
+    parser.add_argument("--catalog", default="book_catalog.json",
+                        help="catalog file; .db/.sqlite/.sqlite3 selects the SQLite backend")
+    parser.add_argument("--migrate-to", metavar="DB_FILE",
+                        help="copy the JSON --catalog into this SQLite database and exit")
+    parser.add_argument("--import", dest="import_file", metavar="FILE",
+                        help="bulk-import books from a .csv or .jsonl file and exit")
+    parser.add_argument("--export", dest="export_file", metavar="FILE",
+                        help="export the catalog to a .csv or .jsonl file and exit")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="books per import batch")
+    parser.add_argument("--rejects", metavar="FILE", help="write rejected import rows (line, reason) to this CSV")
+    parser.add_argument("--serve", action="store_true", help="run the multi-client circulation service")
+    parser.add_argument("--load-test", action="store_true", help="measure throughput of a running service")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--unix-socket", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections for --load-test")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per client for --load-test")
+    parser.add_argument("--stats", action="store_true", help="print circulation analytics and exit")
+    parser.add_argument("--days", type=int, default=30, help="time window for --stats")
+    parser.add_argument("--async-log", action="store_true",
+                        help="write logs from a background thread via a bounded queue")
+    parser.add_argument("--log-json", action="store_true", help="write the log file as JSON lines")
+    parser.add_argument("--log-queue-size", type=int, default=LOG_QUEUE_SIZE,
+                        help="max buffered records for --async-log before dropping")
+    parser.add_argument("--log-rate-limit", type=float, nargs='?', const=LOG_RATE_LIMIT_WINDOW, default=0.0,
+                        help=f"suppress identical warnings repeated within this many seconds "
+                             f"(default off; {LOG_RATE_LIMIT_WINDOW:g}s if given without a value)")
+    args = parser.parse_args()
+    configure_logging(args.async_log, args.log_json, args.log_queue_size, args.log_rate_limit)
+
+    try:
+        if args.serve:
+            inventory = open_inventory(args.catalog)
+            if isinstance(inventory, LibraryInventory):
+                inventory.compact_threshold = SERVICE_COMPACT_THRESHOLD
+            try:
+                asyncio.run(LibraryService(inventory).serve(args.host, args.port, args.unix_socket))
+            except KeyboardInterrupt:
+                print("\nService stopped.")
+            finally:
+                inventory.close()
+        elif args.load_test:
+            asyncio.run(run_load_test(args.host, args.port, args.unix_socket, args.clients, args.requests))
+        elif args.stats:
+            inventory = open_inventory(args.catalog)
+            try:
+                print_circulation_report(inventory, args.days)
+            finally:
+                inventory.close()
+        elif args.migrate_to:
+            count = migrate_json_to_sqlite(args.catalog, args.migrate_to)
+            print(f"Migrated {count} books into {args.migrate_to}")
+        elif args.import_file or args.export_file:
+            inventory = open_inventory(args.catalog)
+            try:
+                if args.import_file:
+                    report = import_catalog(inventory, args.import_file, args.batch_size)
+                    print(f"Import finished: {report}")
+                    if args.rejects:
+                        with open(args.rejects, 'w', encoding='utf-8', newline='') as f:
+                            writer = csv.writer(f)
+                            writer.writerow(['line', 'reason'])
+                            writer.writerows(report.rejected)
+                if args.export_file:
+                    count = export_catalog(inventory, args.export_file)
+                    print(f"Exported {count} books to {args.export_file}")
+            finally:
+                inventory.close()
+        else:
+            cli = LibraryCLI(args.catalog) 
+            cli.run()
+    except CatalogLockedError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
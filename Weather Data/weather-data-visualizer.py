@@ -2,6 +2,8 @@
 #Roll no.=2501730053
 
 import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -10,11 +12,20 @@ import matplotlib.pyplot as plt
 DATA_FILE = "weather.csv"   
 OUTPUT_DIR = Path("output")
 OUTPUT_DIR.mkdir(exist_ok=True)
+LOAD_CHUNKSIZE = 1_000_000
+NUMERIC_COLUMNS = ['temperature', 'humidity', 'rainfall']
+# Canonical column -> accepted header names (case-insensitive), in priority order.
+COLUMN_ALIASES = {
+    "date": ("date", "timestamp"),
+    "temperature": ("temperature", "temp", "t"),
+    "humidity": ("humidity", "hum"),
+    "rainfall": ("rainfall", "rain", "precipitation", "precip"),
+}
 
 def make_sample_weather_csv(path=DATA_FILE):
     """Create a small sample weather.csv so the script can run immediately."""
     print(f"Creating sample dataset at '{path}' (because it was missing).")
-    times = pd.date_range(start="2024-01-01", periods=24, freq="H")
+    times = pd.date_range(start="2024-01-01", periods=24, freq="h")
     temp = 15 + 8 * np.sin(np.linspace(0, 2*np.pi, 24)) + np.random.normal(0, 0.5, 24)
     humidity = 60 + 20 * np.cos(np.linspace(0, 2*np.pi, 24)) + np.random.normal(0, 3, 24)
     rainfall = np.clip(np.random.choice([0,0,0,0.5,1,2,5], size=24, p=[0.6,0.15,0.1,0.05,0.04,0.03,0.03]), 0, None)
@@ -28,68 +39,99 @@ def make_sample_weather_csv(path=DATA_FILE):
     df.to_csv(path, index=False)
     print("Sample CSV created.\n")
 
-def load_dataset(filename=DATA_FILE):
-    """Load CSV; if missing, create a sample then load."""
+def resolve_columns(columns):
+    """Map each canonical column to the first file column matching it or one of its aliases (case-insensitive)."""
+    by_lower = {}
+    for col in columns:
+        by_lower.setdefault(str(col).strip().lower(), col)
+    resolved = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in by_lower:
+                resolved[name] = by_lower[alias]
+                break
+    return resolved
+
+def load_dataset(filename=DATA_FILE, chunksize=LOAD_CHUNKSIZE, float_dtype=np.float32):
+    """
+    Load CSV; if missing, create a sample then load.
+
+    Column aliases are resolved once from the header and only the four needed
+    columns are read, `chunksize` rows at a time. Each chunk is cleaned as it
+    arrives (unparseable dates dropped, numbers coerced to compact `float_dtype`)
+    while running sums/counts build the fill means, so the full raw text never
+    sits in memory. Missing values are then filled with the column means in place.
+    """
     if not Path(filename).exists():
         make_sample_weather_csv(filename)
 
     try:
-        df = pd.read_csv(filename)
+        header = pd.read_csv(filename, nrows=0).columns
     except Exception as e:
         raise RuntimeError(f"Failed to read '{filename}': {e}")
 
-    rename_map = {}
-    cols = [c.lower() for c in df.columns]
-    if "date" not in cols and "timestamp" in cols:
-        rename_map[next(c for c in df.columns if c.lower()=="timestamp")] = "date"
-    if "temperature" not in cols:
-        for alt in ["temp","t"]:
-            if alt in cols:
-                rename_map[next(c for c in df.columns if c.lower()==alt)] = "temperature"
-                break
-    if "humidity" not in cols:
-        for alt in ["hum"]:
-            if alt in cols:
-                rename_map[next(c for c in df.columns if c.lower()==alt)] = "humidity"
-                break
-    if "rainfall" not in cols:
-        for alt in ["rain","precipitation","precip"]:
-            if alt in cols:
-                rename_map[next(c for c in df.columns if c.lower()==alt)] = "rainfall"
-                break
-
-    if rename_map:
-        df = df.rename(columns=rename_map)
-
-    required = {"date", "temperature", "humidity", "rainfall"}
-    missing = required - set(c.lower() for c in df.columns)
+    resolved = resolve_columns(header)
+    missing = set(COLUMN_ALIASES) - set(resolved)
     if missing:
         raise RuntimeError(f"Dataset missing required columns: {missing}")
+    rename_map = {source: name for name, source in resolved.items()}
 
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date']).copy()
+    sums = dict.fromkeys(NUMERIC_COLUMNS, 0.0)
+    counts = dict.fromkeys(NUMERIC_COLUMNS, 0)
+    chunks = []
+    try:
+        reader = pd.read_csv(filename, usecols=list(rename_map), chunksize=chunksize)
+        for chunk in reader:
+            chunk = chunk.rename(columns=rename_map)
+            chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce')
+            chunk = chunk[chunk['date'].notna()]
+            cleaned = {'date': chunk['date']}
+            for col in NUMERIC_COLUMNS:
+                values = pd.to_numeric(chunk[col], errors='coerce')
+                sums[col] += float(values.sum())
+                counts[col] += int(values.count())
+                cleaned[col] = values.astype(float_dtype)
+            chunks.append(pd.DataFrame(cleaned, columns=['date'] + NUMERIC_COLUMNS))
+    except Exception as e:
+        raise RuntimeError(f"Failed to read '{filename}': {e}")
 
-    for col in ['temperature', 'humidity', 'rainfall']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+    if not chunks:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                             **{c: pd.Series(dtype=float_dtype) for c in NUMERIC_COLUMNS}})
+    df = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+    del chunks
 
-    num_cols = ['temperature', 'humidity', 'rainfall']
-    for c in num_cols:
-        if df[c].isna().any():
-            df[c] = df[c].fillna(df[c].mean())
+    for col in NUMERIC_COLUMNS:
+        if counts[col] and df[col].isna().any():
+            df[col] = df[col].fillna(float_dtype(sums[col] / counts[col]))
 
     return df
 
-def analyze_and_plot(df):
-    print("\nData summary:")
-    print(df[['temperature','humidity','rainfall']].describe())
+def analyze_and_plot(df, output_dir=OUTPUT_DIR, verbose=True):
+    """
+    Print the summaries, save the plots and cleaned CSV into `output_dir`, and
+    return the monthly aggregates (month -> readings, temperature/humidity sums
+    and rainfall total) so several stations can be combined.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if verbose:
+        print("\nData summary:")
+        print(df[['temperature','humidity','rainfall']].describe())
 
     df['month'] = df['date'].dt.month
 
-    monthly_mean_temp = df.groupby('month')['temperature'].mean()
-    monthly_rainfall = df.groupby('month')['rainfall'].sum()
+    # Sums in float64 (the frame may be float32) so station aggregates merge without drift.
+    grouped = df[NUMERIC_COLUMNS].astype(np.float64).groupby(df['month'])
+    monthly = grouped.sum().rename(columns={'temperature': 'temperature_sum', 'humidity': 'humidity_sum',
+                                            'rainfall': 'rainfall_total'})
+    monthly.insert(0, 'readings', grouped.size())
+    monthly_mean_temp = (monthly['temperature_sum'] / monthly['readings']).rename('temperature')
+    monthly_rainfall = monthly['rainfall_total'].rename('rainfall')
 
-    print("\nMonthly mean temperature:\n", monthly_mean_temp)
-    print("\nMonthly rainfall totals:\n", monthly_rainfall)
+    if verbose:
+        print("\nMonthly mean temperature:\n", monthly_mean_temp)
+        print("\nMonthly rainfall totals:\n", monthly_rainfall)
 
     plt.figure(figsize=(10,4))
     plt.plot(df['date'], df['temperature'], marker='o', linewidth=1)
@@ -97,7 +139,7 @@ def analyze_and_plot(df):
     plt.ylabel('Temperature (°C)')
     plt.title('Daily Temperature Trend')
     plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "daily_temperature.png")
+    plt.savefig(output_dir / "daily_temperature.png")
     plt.close()
 
     plt.figure(figsize=(8,4))
@@ -106,7 +148,7 @@ def analyze_and_plot(df):
     plt.ylabel('Rainfall (units)')
     plt.title('Monthly Rainfall Total')
     plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "monthly_rainfall.png")
+    plt.savefig(output_dir / "monthly_rainfall.png")
     plt.close()
 
     plt.figure(figsize=(6,4))
@@ -115,7 +157,7 @@ def analyze_and_plot(df):
     plt.ylabel('Humidity (%)')
     plt.title('Humidity vs Temperature')
     plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "humidity_vs_temperature.png")
+    plt.savefig(output_dir / "humidity_vs_temperature.png")
     plt.close()
 
     fig, axes = plt.subplots(1,2,figsize=(12,4))
@@ -130,16 +172,89 @@ def analyze_and_plot(df):
     axes[1].set_ylabel('Humidity (%)')
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "combined_plots.png")
+    plt.savefig(output_dir / "combined_plots.png")
     plt.close()
 
-    df.to_csv(OUTPUT_DIR / "cleaned_weather.csv", index=False)
-    print(f"\nSaved plots and cleaned CSV into '{OUTPUT_DIR.resolve()}'")
+    df.to_csv(output_dir / "cleaned_weather.csv", index=False)
+    if verbose:
+        print(f"\nSaved plots and cleaned CSV into '{output_dir.resolve()}'")
+    return monthly
+
+def process_station(path, output_root=OUTPUT_DIR):
+    """Process-pool worker: load and analyze one station file into output_root/<station>/."""
+    path = Path(path)
+    station = path.stem
+    try:
+        df = load_dataset(path)
+        monthly = analyze_and_plot(df, Path(output_root) / station, verbose=False)
+    except Exception as e:
+        return station, None, str(e)
+    return station, monthly, None
+
+def process_stations(station_dir, output_root=OUTPUT_DIR, workers=None):
+    """
+    Run load_dataset + analyze_and_plot for every *.csv in `station_dir` across
+    a process pool, writing each station's outputs to output_root/<station>/.
+    Writes two merged tables to output_root: station_monthly_summary.csv (one
+    row per station and month) and monthly_summary.csv (all stations combined,
+    weighted by readings). Returns (combined summary, {station: error}).
+    """
+    paths = sorted(Path(station_dir).glob("*.csv"))
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    frames, errors = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for station, monthly, error in pool.map(process_station, paths, [output_root] * len(paths)):
+            if error is not None:
+                errors[station] = error
+                print(f"  {station}: FAILED ({error})")
+                continue
+            frames.append(monthly.reset_index().assign(station=station))
+            print(f"  {station}: {int(monthly['readings'].sum())} readings")
+
+    if not frames:
+        return pd.DataFrame(), errors
+    per_station = pd.concat(frames, ignore_index=True)
+    per_station['mean_temperature'] = per_station['temperature_sum'] / per_station['readings']
+    per_station['mean_humidity'] = per_station['humidity_sum'] / per_station['readings']
+    per_station[['station', 'month', 'readings', 'mean_temperature', 'mean_humidity', 'rainfall_total']] \
+        .to_csv(output_root / "station_monthly_summary.csv", index=False)
+
+    combined = per_station.groupby('month').agg(stations=('station', 'nunique'),
+                                                 readings=('readings', 'sum'),
+                                                 temperature_sum=('temperature_sum', 'sum'),
+                                                 humidity_sum=('humidity_sum', 'sum'),
+                                                 rainfall_total=('rainfall_total', 'sum'))
+    combined['mean_temperature'] = combined['temperature_sum'] / combined['readings']
+    combined['mean_humidity'] = combined['humidity_sum'] / combined['readings']
+    combined['mean_station_rainfall'] = combined['rainfall_total'] / combined['stations']
+    combined = combined[['stations', 'readings', 'mean_temperature', 'mean_humidity',
+                         'rainfall_total', 'mean_station_rainfall']]
+    combined.to_csv(output_root / "monthly_summary.csv")
+    return combined, errors
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Weather data visualizer")
+    parser.add_argument("--data-file", default=DATA_FILE, help="single-station CSV")
+    parser.add_argument("--stations", metavar="DIR", help="process every station CSV in DIR")
+    parser.add_argument("--workers", type=int, default=None, help="processes for --stations (default: CPU count)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.stations:
+        print(f"Processing stations in '{args.stations}'...")
+        combined, errors = process_stations(args.stations, OUTPUT_DIR, args.workers)
+        if not combined.empty:
+            print("\nCross-station monthly summary:\n", combined)
+        if errors:
+            print(f"\n{len(errors)} station(s) failed.")
+        print(f"\nDone. Per-station results are in '{OUTPUT_DIR}/<station>/'.")
+        return
 
-def main():
     print("Starting weather data visualizer...")
     try:
-        df = load_dataset(DATA_FILE)
+        df = load_dataset(args.data_file)
     except RuntimeError as e:
         print("ERROR loading dataset:", e)
         return
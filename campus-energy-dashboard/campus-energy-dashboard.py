@@ -1,15 +1,266 @@
 # Name = Tushar saini
 # Roll no. =2501730053
 
+import argparse
+import contextlib
+import cProfile
+import hashlib
+import io
+import json
 import os
+import pickle
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+import weakref
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 
 
 
-def load_all_csv(data_dir="data"):
+CACHE_DIR = Path("cache")
+METRICS_FILE = Path("output/metrics.json")
+TIMESTAMP_FORMAT = "ISO8601"
+READ_DTYPES = {'kwh': 'float64'}
+STREAM_CHUNKSIZE = 500_000
+WATCH_INTERVAL = 5.0
+WATCH_SCATTER_BUCKETS = 4096
+PEAK_TOP_N = 5
+BASELINE_WINDOW = 24
+SPIKE_Z = 3.0
+SUSTAIN_QUANTILE = 0.9
+SUSTAIN_MIN_READINGS = 3
+
+
+def _read_counting_bad_lines(path, **kwargs):
+    """
+    read_csv that skips malformed lines and also returns how many it skipped.
+    The C parser reports skipped lines only through ParserWarning (a callable
+    on_bad_lines would force the much slower python engine), so count those.
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', pd.errors.ParserWarning)
+        df = pd.read_csv(path, on_bad_lines='warn', **kwargs)
+    bad = 0
+    for w in caught:
+        if issubclass(w.category, pd.errors.ParserWarning):
+            bad += str(w.message).count('Skipping line')
+        else:
+            warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
+    return df, bad
+
+
+def _match_tz(ts, tz):
+    """`ts` localized to or converted into `tz` (None: naive), so it can be assigned into such a column."""
+    if ts.dt.tz is None:
+        return ts if tz is None else ts.dt.tz_localize(tz)
+    return ts.dt.tz_convert(tz)
+
+
+def clean_meter_frame(df, building):
+    """
+    Parse timestamps, coerce kWh and tag the building. Timestamps go through
+    the ISO8601 fast path first; the values it missed get the baseline's
+    parse, one format inferred from them, so other formats come out the same.
+    """
+    raw = df['timestamp']
+    ts = pd.to_datetime(raw, format=TIMESTAMP_FORMAT, errors='coerce')
+    retry = ts.isna() & raw.notna()
+    if retry.any():
+        with warnings.catch_warnings():
+            # with no inferable format pandas falls back to dateutil per element, as before
+            warnings.filterwarnings('ignore', message='Could not infer format', category=UserWarning)
+            parsed = pd.to_datetime(raw[retry], errors='coerce')
+        if retry.all():
+            ts = parsed
+        else:
+            ts[retry] = _match_tz(parsed, ts.dt.tz)
+    df['timestamp'] = ts
+    df['kwh'] = pd.to_numeric(df['kwh'], errors='coerce')
+    df = df.dropna(subset=['timestamp'])
+    df['building'] = building
+    return df
+
+
+def timestamp_values(ts):
+    """datetime64 array of a timestamp column; tz-aware columns (ISO8601 offsets) become naive UTC."""
+    if isinstance(ts.dtype, pd.DatetimeTZDtype):
+        ts = ts.dt.tz_convert(None)
+    return ts.to_numpy()
+
+
+def parse_meter_file(path):
+    """Parse one meter CSV. Returns (df or None, stats dict); runs in worker processes."""
+    path = Path(path)
+    start = time.perf_counter()
+    stats = {'file': path.name, 'rows': 0, 'rejected': 0, 'seconds': 0.0, 'error': None}
+    try:
+        try:
+            df, bad_lines = _read_counting_bad_lines(path, dtype=READ_DTYPES)
+        except ValueError:
+            # non-numeric kwh values: fall back to inferred dtypes and coerce
+            df, bad_lines = _read_counting_bad_lines(path)
+
+        if 'timestamp' not in df.columns or 'kwh' not in df.columns:
+            stats['error'] = "missing timestamp or kwh column"
+            return None, stats
+
+        read = len(df)
+        df = clean_meter_frame(df, path.stem)
+        stats['rows'] = len(df)
+        stats['rejected'] = bad_lines + read - len(df)
+        return df, stats
+    except Exception as e:
+        stats['error'] = str(e)
+        return None, stats
+    finally:
+        stats['seconds'] = time.perf_counter() - start
+
+
+def parse_meter_files(files, workers=None):
+    """Parse meter files on a process pool. Returns [(df or None, stats)] in the order of `files`."""
+    files = list(files)
+    if workers is None:
+        workers = min(len(files), os.cpu_count() or 1)
+
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse_meter_file, files, chunksize=max(1, len(files) // (workers * 4))))
+    return [parse_meter_file(f) for f in files]
+
+
+def ingest_csv_files(files, workers=None):
+    """
+    Parse meter files on a process pool and concatenate them once.
+    Returns (merged DataFrame, list of per-file stats) in the order of `files`.
+    """
+    results = parse_meter_files(files, workers)
+    frames = [df for df, _ in results if df is not None]
+    stats = [s for _, s in results]
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return merged, stats
+
+
+class MeterCache:
+    """
+    Columnar on-disk cache of parsed meter files.
+    Each entry is a directory of .npy column files plus meta.json, keyed by
+    the source path and invalidated when the file's mtime or size changes.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / "index.json"
+        self.index = {}
+        if self.index_file.exists():
+            try:
+                with self.index_file.open('r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self.index = data['entries']
+            except (OSError, ValueError, KeyError):
+                self.index = {}
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _mappable(dtype):
+        try:
+            return np.dtype(dtype).kind in 'biufcmM'
+        except TypeError:
+            return False
+
+    def _entry_dir(self, key):
+        return self.cache_dir / hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def lookup(self, path):
+        """Returns (df or None, stats) for a fresh entry, or None on a miss."""
+        key = self._key(path)
+        entry = self.index.get(key)
+        if entry is None or tuple(entry['signature']) != self._signature(path):
+            return None
+
+        stats = dict(entry['stats'], seconds=0.0, cached=True)
+        if stats['error']:
+            return None, stats
+        try:
+            entry_dir = self._entry_dir(key)
+            columns = {}
+            for i, (col, dtype) in enumerate(zip(entry['columns'], entry['dtypes'])):
+                # Object columns (text, categories) are pickled and cannot be memory-mapped.
+                mmap_mode = 'r' if self._mappable(dtype) else None
+                arr = np.load(entry_dir / f"{i}.npy", mmap_mode=mmap_mode, allow_pickle=True)
+                columns[col] = pd.Series(arr, copy=False).astype(dtype, copy=False)
+            df = pd.DataFrame(columns, copy=False)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+        df['building'] = Path(path).stem
+        return df, stats
+
+    def store(self, path, df, stats):
+        key = self._key(path)
+        entry_dir = self._entry_dir(key)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        columns = []
+        if df is not None:
+            columns = [c for c in df.columns if c != 'building']
+            for i, col in enumerate(columns):
+                np.save(entry_dir / f"{i}.npy", df[col].to_numpy(), allow_pickle=True)
+        self.index[key] = {
+            'signature': list(self._signature(path)),
+            'columns': columns,
+            'dtypes': [str(df[c].dtype) for c in columns],
+            'stats': {k: v for k, v in stats.items() if k != 'seconds'},
+        }
+
+    def prune(self):
+        """Drops entries whose source file no longer exists."""
+        for key in [k for k in self.index if not Path(k).exists()]:
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            del self.index[key]
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_file.with_suffix('.tmp')
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': self.index}, f)
+        os.replace(tmp, self.index_file)
+
+
+def print_ingest_report(stats):
+    for s in stats:
+        if s['error'] == "missing timestamp or kwh column":
+            print(f"WARNING: {s['file']} skipped (missing timestamp or kwh column)")
+        elif s['error']:
+            print(f"ERROR reading {s['file']}: {s['error']}")
+        else:
+            source = "cached" if s.get('cached') else f"{s['seconds']:.3f}s"
+            print(f"Loaded: {s['file']:<30} {s['rows']:>10} rows  {s['rejected']:>6} rejected  {source}")
+    total_rows = sum(s['rows'] for s in stats)
+    total_rejected = sum(s['rejected'] for s in stats)
+    print(f"Total: {len(stats)} files, {total_rows} rows, {total_rejected} rows rejected")
+
+
+def load_all_csv(data_dir="data", workers=None, cache_dir=CACHE_DIR):
     print("\n=== SCANNING DATA DIRECTORY ===")
 
     files = list(Path(data_dir).glob("*.csv"))
@@ -19,25 +270,25 @@ def load_all_csv(data_dir="data"):
         print("Please add files like building1.csv, building2.csv, etc.\n")
         return pd.DataFrame()  
 
-    master_df = pd.DataFrame()
-
-    for file in files:
-        try:
-            print(f"Loading: {file.name}")
-            df = pd.read_csv(file, on_bad_lines='skip')
-
-            if 'timestamp' not in df.columns or 'kwh' not in df.columns:
-                print(f"WARNING: {file.name} skipped (missing timestamp or kwh column)")
-                continue
-
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            df = df.dropna(subset=['timestamp'])
-
-            df['building'] = file.stem
-            master_df = pd.concat([master_df, df], ignore_index=True)
-
-        except Exception as e:
-            print(f"ERROR reading {file}: {e}")
+    if cache_dir is None:
+        master_df, stats = ingest_csv_files(files, workers)
+    else:
+        cache = MeterCache(cache_dir)
+        results = [cache.lookup(f) for f in files]
+        stale = [f for f, r in zip(files, results) if r is None]
+        if stale:
+            parsed = iter(parse_meter_files(stale, workers))
+            for i, r in enumerate(results):
+                if r is None:
+                    results[i] = next(parsed)
+                    cache.store(files[i], *results[i])
+        cache.prune()
+        cache.save()
+        frames = [df for df, _ in results if df is not None]
+        stats = [s for _, s in results]
+        master_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        print(f"Cache: {len(files) - len(stale)} files reused, {len(stale)} parsed")
+    print_ingest_report(stats)
 
     print("\nMerged DataFrame Created Successfully!")
     print(master_df.head())
@@ -56,21 +307,199 @@ def building_wise_summary(df):
 
 
 
+class StreamingAggregator:
+    """
+    Mergeable partial aggregates over meter readings: per-building daily kWh
+    sums plus running count/sum/min/max per building and the campus peak.
+    Memory depends on buildings x days, not on the number of readings.
+    """
+    COMPACT_EVERY = 64
+
+    def __init__(self):
+        self._daily_parts = []
+        self._buildings = None
+        self.peak_kwh = None
+        self.peak_time = None
+        self.rows = 0
+
+    def update(self, df):
+        """Folds a cleaned chunk (timestamp, kwh, building) into the aggregates."""
+        if df.empty:
+            return
+        self.rows += len(df)
+        day = df['timestamp'].dt.floor('D').rename('timestamp')
+        self._daily_parts.append(df.groupby(['building', day])['kwh'].sum())
+        part = df.groupby('building')['kwh'].agg(['count', 'sum', 'min', 'max'])
+        self._merge_buildings(part)
+
+        kwh = df['kwh']
+        if kwh.notna().any():
+            idx = kwh.idxmax()
+            if self.peak_kwh is None or kwh[idx] > self.peak_kwh:
+                self.peak_kwh = float(kwh[idx])
+                self.peak_time = df.at[idx, 'timestamp']
+
+        if len(self._daily_parts) >= self.COMPACT_EVERY:
+            self._compact()
+
+    def merge(self, other):
+        """Folds another aggregator in; `other` is treated as coming after this one."""
+        self.rows += other.rows
+        self._daily_parts.extend(other._daily_parts)
+        if other._buildings is not None:
+            self._merge_buildings(other._buildings)
+        if other.peak_kwh is not None and (self.peak_kwh is None or other.peak_kwh > self.peak_kwh):
+            self.peak_kwh, self.peak_time = other.peak_kwh, other.peak_time
+        self._compact()
+        return self
+
+    def _merge_buildings(self, part):
+        if self._buildings is None:
+            self._buildings = part
+            return
+        both = pd.concat([self._buildings, part])
+        self._buildings = both.groupby(level=0).agg({'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'})
+
+    def _compact(self):
+        if len(self._daily_parts) > 1:
+            self._daily_parts = [pd.concat(self._daily_parts).groupby(level=[0, 1]).sum()]
+
+    def daily_by_building(self):
+        """Series indexed by (building, day) with that day's kWh total."""
+        self._compact()
+        if not self._daily_parts:
+            return pd.Series(dtype='float64', name='kwh')
+        return self._daily_parts[0].rename('kwh')
+
+    def daily_totals(self):
+        """Same result as calculate_daily_totals on the full data set."""
+        daily = self.daily_by_building().groupby(level='timestamp').sum()
+        return daily.resample('D').sum()
+
+    def weekly_totals(self):
+        """Same result as calculate_weekly_totals on the full data set."""
+        return self.daily_totals().resample('W').sum()
+
+    def building_summary(self):
+        """Same result as building_wise_summary on the full data set."""
+        if self._buildings is None:
+            return pd.DataFrame(columns=['mean', 'min', 'max', 'sum'])
+        b = self._buildings.sort_index()
+        summary = pd.DataFrame({
+            'mean': b['sum'] / b['count'].where(b['count'] > 0),
+            'min': b['min'],
+            'max': b['max'],
+            'sum': b['sum'],
+        })
+        summary.index.name = 'building'
+        return summary
+
+
+def aggregate_meter_file(path, chunksize=STREAM_CHUNKSIZE):
+    """Streams one meter CSV in chunks into a StreamingAggregator (runs in worker processes)."""
+    path = Path(path)
+    agg = StreamingAggregator()
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+        if 'timestamp' not in header or 'kwh' not in header:
+            print(f"WARNING: {path.name} skipped (missing timestamp or kwh column)")
+            return agg
+        # usecols is not used on purpose: it stops the parser from rejecting rows with extra fields
+        reader = pd.read_csv(path, on_bad_lines='skip', chunksize=chunksize)
+        for chunk in reader:
+            agg.update(clean_meter_frame(chunk[['timestamp', 'kwh']].copy(), path.stem))
+    except Exception as e:
+        # Same policy as parse_meter_file: report the file and leave it out entirely.
+        print(f"ERROR reading {path.name}: {e}")
+        return StreamingAggregator()
+    return agg
+
+
+def stream_aggregates(data_dir="data", workers=None, chunksize=STREAM_CHUNKSIZE):
+    """
+    Out-of-core alternative to load_all_csv + the total functions: every file is
+    read in chunks on a process pool and the per-file partial aggregates are merged.
+    """
+    files = list(Path(data_dir).glob("*.csv"))
+    if workers is None:
+        workers = min(len(files), os.cpu_count() or 1)
+
+    total = StreamingAggregator()
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for agg in pool.map(aggregate_meter_file, files, [chunksize] * len(files)):
+                total.merge(agg)
+    else:
+        for f in files:
+            total.merge(aggregate_meter_file(f, chunksize))
+    return total
+
+
+
 class MeterReading:
+    __slots__ = ('timestamp', 'kwh')
+
     def __init__(self, timestamp, kwh):
         self.timestamp = timestamp
         self.kwh = kwh
 
+
+class MeterReadingsView(Sequence):
+    """Read-only sequence of MeterReading objects created on access from a building's arrays."""
+    def __init__(self, building):
+        self._building = building
+
+    def __len__(self):
+        return len(self._building.kwh)
+
+    def __getitem__(self, i):
+        timestamps, kwh = self._building.timestamps, self._building.kwh
+        if isinstance(i, slice):
+            return [MeterReading(pd.Timestamp(t), k) for t, k in zip(timestamps[i], kwh[i])]
+        return MeterReading(pd.Timestamp(timestamps[i]), kwh[i])
+
+
 class Building:
-    def __init__(self, name):
+    def __init__(self, name, timestamps=None, kwh=None):
         self.name = name
-        self.meter_readings = []
+        self._timestamps = np.array([], dtype='datetime64[ns]') if timestamps is None else timestamps
+        self._kwh = np.array([], dtype='float64') if kwh is None else kwh
+        self._pending = []
+
+    def _consolidate(self):
+        if self._pending:
+            ts, kwh = zip(*self._pending)
+            self._timestamps = np.concatenate([self._timestamps, pd.to_datetime(list(ts)).to_numpy()])
+            self._kwh = np.concatenate([self._kwh, np.asarray(kwh, dtype='float64')])
+            self._pending = []
+
+    @property
+    def timestamps(self):
+        self._consolidate()
+        return self._timestamps
+
+    @property
+    def kwh(self):
+        self._consolidate()
+        return self._kwh
+
+    @property
+    def meter_readings(self):
+        return MeterReadingsView(self)
 
     def add_reading(self, reading):
-        self.meter_readings.append(reading)
+        self._pending.append((reading.timestamp, reading.kwh))
+
+    def add_arrays(self, timestamps, kwh):
+        self._consolidate()
+        if len(self._kwh):
+            self._timestamps = np.concatenate([self._timestamps, timestamps])
+            self._kwh = np.concatenate([self._kwh, kwh])
+        else:
+            self._timestamps, self._kwh = timestamps, kwh
 
     def calculate_total_consumption(self):
-        return sum(r.kwh for r in self.meter_readings)
+        return float(np.nansum(self.kwh))
 
     def generate_report(self):
         total = self.calculate_total_consumption()
@@ -82,14 +511,23 @@ class BuildingManager:
         self.buildings = {}
 
     def load_from_dataframe(self, df):
-        for _, row in df.iterrows():
-            building_name = row['building']
+        """
+        Groups the frame by building in one stable argsort pass; every Building
+        keeps contiguous slices of the sorted timestamp/kWh arrays.
+        """
+        if df.empty:
+            return
+        codes, names = pd.factorize(df['building'], use_na_sentinel=False)
+        order = np.argsort(codes, kind='stable')
+        timestamps = timestamp_values(df['timestamp'])[order]
+        kwh = df['kwh'].to_numpy(dtype='float64')[order]
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
 
+        for i, building_name in enumerate(names):
+            lo, hi = bounds[i], bounds[i + 1]
             if building_name not in self.buildings:
                 self.buildings[building_name] = Building(building_name)
-
-            reading = MeterReading(row['timestamp'], row['kwh'])
-            self.buildings[building_name].add_reading(reading)
+            self.buildings[building_name].add_arrays(timestamps[lo:hi], kwh[lo:hi])
 
     def full_report(self):
         print("\n===== BUILDING ENERGY REPORT =====")
@@ -97,15 +535,97 @@ class BuildingManager:
             print(building.generate_report())
 
 
-def generate_dashboard(df):
+class DashboardData:
+    """
+    Per-building daily/weekly series and summary figures shared by the dashboard
+    panels and export_outputs, derived from one StreamingAggregator pass.
+    """
+    def __init__(self, agg, building_order=None):
+        daily = agg.daily_by_building()
+        per_building = {b: s.droplevel(0).resample('D').sum() for b, s in daily.groupby(level=0)}
+        order = building_order if building_order is not None else sorted(per_building)
+        self.daily = {b: per_building[b] for b in order if b in per_building}
+        self.weekly = pd.DataFrame({b: s.resample('W').sum() for b, s in self.daily.items()})
+        self.weekly = self.weekly.reindex(columns=sorted(self.weekly.columns))
+        self.weekly_mean = self.weekly.mean()
+        self.summary = agg.building_summary()
+        self.total = self.summary['sum'].sum()
+        self.peak_time = agg.peak_time
+        self.timestamps = None
+        self.kwh = None
+
+    @classmethod
+    def from_dataframe(cls, df):
+        agg = StreamingAggregator()
+        agg.update(df)
+        data = cls(agg, building_order=list(df['building'].unique()))
+        data.timestamps = timestamp_values(df['timestamp'])
+        data.kwh = df['kwh'].to_numpy()
+        return data
+
+
+_dashboard_cache = {}
+
+
+def get_dashboard_data(df):
+    """Returns the DashboardData for `df`, computed once per DataFrame object."""
+    key = id(df)
+    cached = _dashboard_cache.get(key)
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+    data = DashboardData.from_dataframe(df)
+    _dashboard_cache[key] = (weakref.ref(df, lambda _, key=key: _dashboard_cache.pop(key, None)), data)
+    return data
+
+
+def decimate_minmax(x, y, buckets):
+    """
+    Reduce a scatter to at most 2 points per time bucket: the minimum and the
+    maximum reading. Peaks survive, and the point count is bounded by `buckets`.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    if len(y) <= 2 * buckets:
+        return x, y
+
+    xi = x.view('int64') if np.issubdtype(x.dtype, np.datetime64) else x.astype('float64')
+    lo, hi = xi.min(), xi.max()
+    span = float(hi - lo) or 1.0
+    bucket = np.minimum(((xi - lo) / span * buckets).astype('int64'), buckets - 1)
+
+    grouped = pd.Series(y).groupby(bucket)
+    picked = np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+    return x[picked], y[picked]
+
+
+def plot_density(ax, x, y, width_px, height_px):
+    """Draw the readings as a log-scaled 2-D histogram with about one bin per pixel."""
+    y = np.asarray(y, dtype='float64')
+    keep = ~np.isnan(y)
+    xn = mdates.date2num(np.asarray(x)[keep])
+    counts, xedges, yedges = np.histogram2d(xn, y[keep], bins=(max(width_px, 1), max(height_px, 1)))
+    masked = np.ma.masked_equal(counts.T, 0)
+    ax.imshow(masked, origin='lower', aspect='auto', cmap='viridis', norm=LogNorm(),
+              extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]))
+    # isolated peaks are a single count in the raster, so mark the per-column maxima on top
+    px, py = decimate_minmax(np.asarray(x)[keep], y[keep], max(width_px, 1))
+    top = py >= np.percentile(py, 99)
+    ax.scatter(mdates.date2num(px[top]), py[top], s=6, c='red')
+    ax.xaxis_date()
+
+
+def generate_dashboard(df, data=None, scatter_mode="decimate"):
     print("\nGenerating dashboard...")
+    if data is None:
+        data = get_dashboard_data(df)
 
     plt.figure(figsize=(16, 8))
 
  
     plt.subplot(1, 3, 1)
-    for b in df['building'].unique():
-        daily = calculate_daily_totals(df[df['building'] == b])
+    for b, daily in data.daily.items():
         plt.plot(daily.index, daily.values, label=b)
     plt.title("Daily Energy Consumption")
     plt.xlabel("Date")
@@ -113,15 +633,21 @@ def generate_dashboard(df):
     plt.legend()
 
     plt.subplot(1, 3, 2)
-    weekly = df.set_index('timestamp').groupby('building')['kwh'].resample('W').sum().unstack(0)
-    weekly_mean = weekly.mean()
+    weekly_mean = data.weekly_mean
     plt.bar(weekly_mean.index, weekly_mean.values)
     plt.title("Weekly Average kWh by Building")
     plt.xlabel("Building")
     plt.ylabel("Average kWh")
 
-    plt.subplot(1, 3, 3)
-    plt.scatter(df['timestamp'], df['kwh'], s=10)
+    ax = plt.subplot(1, 3, 3)
+    bbox = ax.get_window_extent()
+    if scatter_mode == "density":
+        plot_density(ax, data.timestamps, data.kwh, int(bbox.width), int(bbox.height))
+    elif scatter_mode == "raw":
+        plt.scatter(data.timestamps, data.kwh, s=10)
+    else:
+        x, y = decimate_minmax(data.timestamps, data.kwh, int(bbox.width))
+        plt.scatter(x, y, s=10)
     plt.title("Peak Load Scatter Plot")
     plt.xlabel("Time")
     plt.ylabel("kWh")
@@ -135,18 +661,92 @@ def generate_dashboard(df):
 
 
 
-def export_outputs(df):
-    Path("output").mkdir(exist_ok=True)
+def detect_peaks(df, top_n=PEAK_TOP_N, window=BASELINE_WINDOW, z_threshold=SPIKE_Z,
+                 sustain_quantile=SUSTAIN_QUANTILE, min_sustain=SUSTAIN_MIN_READINGS):
+    """
+    Peak and anomaly detection over each building's time-sorted series, in one
+    sort plus vectorized passes (no per-building Python loop). Returns one row per finding:
+      top       - the building's `top_n` highest readings
+      spike     - readings more than `z_threshold` standard deviations above the
+                  mean of the previous `window` readings of that building
+      sustained - runs of at least `min_sustain` consecutive readings above the
+                  building's `sustain_quantile` load
+    """
+    columns = ['building', 'kind', 'rank', 'start', 'end', 'readings', 'peak_kwh', 'mean_kwh', 'zscore']
+    d = df[['building', 'timestamp', 'kwh']].dropna(subset=['kwh'])
+    if d.empty:
+        return pd.DataFrame(columns=columns)
 
-    df.to_csv("output/cleaned_energy_data.csv", index=False)
-    summary = building_wise_summary(df)
-    summary.to_csv("output/building_summary.csv")
+    codes, names = pd.factorize(d['building'])
+    # two stable sorts instead of np.lexsort: fast when each building's rows are already in time order
+    order = np.argsort(d['timestamp'].to_numpy(), kind='stable')
+    order = order[np.argsort(codes[order], kind='stable')]
+    codes = codes[order]
+    ts = d['timestamp'].to_numpy()[order]
+    kwh = d['kwh'].to_numpy(dtype='float64')[order]
+    n = len(kwh)
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    pos = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+
+    # rolling baseline over the previous `window` readings; windows that would
+    # reach into the previous building are masked out via `pos`
+    roll = pd.Series(kwh).rolling(window)
+    base_mean = roll.mean().shift(1).to_numpy()
+    base_std = roll.std().shift(1).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (kwh - base_mean) / base_std
+    z[(pos < window) | ~(base_std > 0)] = np.nan
+    spike = z > z_threshold
+
+    # top-N via a grouped descending rank (ties go to the earlier reading); only
+    # the selected rows are sorted, into building then rank order
+    rank = pd.Series(kwh).groupby(codes).rank(method='first', ascending=False).to_numpy()
+    top = np.flatnonzero(rank <= top_n)
+    top = top[np.lexsort((rank[top], codes[top]))]
+    top_rank = rank[top].astype('int64')
+
+    threshold = pd.Series(kwh).groupby(codes).quantile(sustain_quantile).to_numpy()[codes]
+    high = kwh > threshold
+    run_id = np.cumsum(np.r_[True, (high[1:] != high[:-1]) | (codes[1:] != codes[:-1])])
+    runs = pd.DataFrame({'run': run_id[high], 'code': codes[high], 'ts': ts[high], 'kwh': kwh[high]})
+    runs = runs.groupby('run').agg(code=('code', 'first'), start=('ts', 'first'), end=('ts', 'last'),
+                                   readings=('kwh', 'size'), peak_kwh=('kwh', 'max'), mean_kwh=('kwh', 'mean'))
+    runs = runs[runs['readings'] >= min_sustain]
+
+    parts = [
+        pd.DataFrame({'building': names[codes[top]], 'kind': 'top', 'rank': top_rank,
+                      'start': ts[top], 'end': ts[top], 'readings': 1,
+                      'peak_kwh': kwh[top], 'mean_kwh': kwh[top], 'zscore': z[top]}),
+        pd.DataFrame({'building': names[codes[spike]], 'kind': 'spike', 'rank': pd.NA,
+                      'start': ts[spike], 'end': ts[spike], 'readings': 1,
+                      'peak_kwh': kwh[spike], 'mean_kwh': base_mean[spike], 'zscore': z[spike]}),
+        pd.DataFrame({'building': names[runs['code'].to_numpy()], 'kind': 'sustained', 'rank': pd.NA,
+                      'start': runs['start'].to_numpy(), 'end': runs['end'].to_numpy(),
+                      'readings': runs['readings'].to_numpy(), 'peak_kwh': runs['peak_kwh'].to_numpy(),
+                      'mean_kwh': runs['mean_kwh'].to_numpy(), 'zscore': np.nan}),
+    ]
+    peaks = pd.concat([p for p in parts if len(p)], ignore_index=True)
+    return peaks.reindex(columns=columns)
+
+
+def peaks_report(peaks):
+    """Per-building text block for summary.txt."""
+    if peaks.empty:
+        return ""
+    lines = ["PEAKS AND ANOMALIES", "----------------------------"]
+    counts = peaks.groupby(['building', 'kind']).size().unstack(fill_value=0)
+    best = peaks[peaks['kind'] == 'top'].sort_values('rank').groupby('building').first()
+    for building, row in best.iterrows():
+        spikes = counts.at[building, 'spike'] if 'spike' in counts else 0
+        sustained = counts.at[building, 'sustained'] if 'sustained' in counts else 0
+        lines.append(f"{building}: peak {row['peak_kwh']:.2f} kWh at {row['start']}, "
+                     f"{spikes} spikes, {sustained} sustained high-load windows")
+    lines.append("----------------------------")
+    return "\n".join(lines) + "\n"
 
-    total_consumption = df['kwh'].sum()
-    highest_building = summary['sum'].idxmax()
-    peak_row = df.loc[df['kwh'].idxmax()]
-    peak_time = peak_row['timestamp']
 
+def write_summary_report(total_consumption, highest_building, peak_time, extra=""):
     report_text = f"""
 CAMPUS ENERGY SUMMARY REPORT
 ----------------------------
@@ -155,6 +755,8 @@ Highest Consuming Building: {highest_building}
 Peak Load Time: {peak_time}
 ----------------------------
 """
+    if extra:
+        report_text += "\n" + extra
 
     with open("output/summary.txt", "w") as f:
         f.write(report_text)
@@ -162,23 +764,430 @@ Peak Load Time: {peak_time}
     print("Summary saved as output/summary.txt")
 
 
+def export_outputs(df, data=None):
+    Path("output").mkdir(exist_ok=True)
+    if data is None:
+        data = get_dashboard_data(df)
+
+    df.to_csv("output/cleaned_energy_data.csv", index=False)
+    summary = data.summary
+    summary.to_csv("output/building_summary.csv")
+
+    peaks = detect_peaks(df)
+    peaks.to_csv("output/peaks.csv", index=False)
+    print("Peaks saved as output/peaks.csv")
 
-def main():
-    df = load_all_csv("data")
+    write_summary_report(data.total, summary['sum'].idxmax(), data.peak_time, peaks_report(peaks))
 
-    if df.empty:
+
+def run_streaming(data_dir="data", workers=None, chunksize=STREAM_CHUNKSIZE):
+    """Bounded-memory pipeline: totals, building summary and summary.txt without a merged DataFrame."""
+    print("\n=== STREAMING AGGREGATION ===")
+    agg = stream_aggregates(data_dir, workers, chunksize)
+    if agg.rows == 0:
         print("\nPROGRAM STOPPED: No valid data found.")
         return
 
-    bm = BuildingManager()
-    bm.load_from_dataframe(df)
-    bm.full_report()
+    summary = agg.building_summary()
+    print("\n===== BUILDING ENERGY REPORT =====")
+    for name, total in summary['sum'].items():
+        print(f"{name}: {total:.2f} kWh")
+
+    Path("output").mkdir(exist_ok=True)
+    summary.to_csv("output/building_summary.csv")
+    agg.daily_totals().to_csv("output/daily_totals.csv")
+    agg.weekly_totals().to_csv("output/weekly_totals.csv")
+    write_summary_report(summary['sum'].sum(), summary['sum'].idxmax(), agg.peak_time)
+    print(f"\nStreamed {agg.rows} readings.")
+
+
+
+class MeterWatcher:
+    """
+    Long-running watch mode: remembers how far each CSV in `data_dir` has been
+    read and folds only new or appended rows into running aggregates. A file
+    that shrinks, gets a new inode, or whose first bytes or bytes just before
+    the read offset change (an in-place rewrite) triggers a full rebuild.
+    Per-file read errors are logged and retried on the next poll.
+    """
+    READ_BLOCK = 64 * 1024 * 1024
+    FINGERPRINT_BYTES = 4096
+
+    def __init__(self, data_dir="data", scatter_buckets=WATCH_SCATTER_BUCKETS):
+        self.data_dir = Path(data_dir)
+        self.scatter_buckets = scatter_buckets
+        self.reset()
+
+    def reset(self):
+        self.files = {}
+        self.agg = StreamingAggregator()
+        self.building_order = []
+        self.points_x = np.array([], dtype='datetime64[ns]')
+        self.points_y = np.array([], dtype='float64')
+
+    def _read_new_rows(self, path, state):
+        """
+        Yields cleaned frames for the complete lines after state['offset'],
+        advancing the offset only once a block has been parsed. The header is
+        taken only once its line is complete, so a file caught mid-copy (empty,
+        or a partial header) is simply retried on the next poll.
+        """
+        with open(path, 'rb') as f:
+            if state['header'] is None:
+                header = f.readline()
+                if not header.endswith(b'\n'):
+                    return
+                columns = pd.read_csv(io.BytesIO(header), nrows=0).columns
+                state['header'] = header
+                state['offset'] = len(header)
+                self._remember_position(f, state)
+                if 'timestamp' not in columns or 'kwh' not in columns:
+                    print(f"WARNING: {path.name} skipped (missing timestamp or kwh column)")
+                    state['skip'] = True
+            if state['skip']:
+                return
+            f.seek(state['offset'])
+            while True:
+                block = f.read(self.READ_BLOCK)
+                end = block.rfind(b'\n') + 1
+                if end == 0:
+                    break
+                df = pd.read_csv(io.BytesIO(state['header'] + block[:end]), on_bad_lines='skip')
+                df = clean_meter_frame(df[['timestamp', 'kwh']].copy(), path.stem)
+                state['offset'] += end
+                self._remember_position(f, state)
+                yield df
+                f.seek(state['offset'])
+
+    def _remember_position(self, f, state):
+        """Keeps the file's first bytes and the bytes just before the offset to detect in-place rewrites."""
+        offset = state['offset']
+        f.seek(0)
+        state['prefix'] = f.read(min(offset, self.FINGERPRINT_BYTES))
+        start = max(offset - self.FINGERPRINT_BYTES, 0)
+        f.seek(start)
+        state['tail'] = f.read(offset - start)
+
+    def _was_replaced(self, path, st, state):
+        """True when the consumed part of `path` no longer matches what was read."""
+        if st.st_ino != state['ino'] or st.st_size < state['size']:
+            return True
+        if st.st_mtime_ns == state['mtime_ns'] or state['header'] is None:
+            return False
+        with open(path, 'rb') as f:
+            if f.read(len(state['prefix'])) != state['prefix']:
+                return True
+            f.seek(state['offset'] - len(state['tail']))
+            return f.read(len(state['tail'])) != state['tail']
+
+    def poll(self):
+        """Reads whatever changed since the last poll. Returns the number of new rows."""
+        added = 0
+        for path in sorted(self.data_dir.glob("*.csv")):
+            try:
+                st = path.stat()
+                state = self.files.get(path)
+                if state is not None and self._was_replaced(path, st, state):
+                    print(f"{path.name} was truncated or replaced; rebuilding aggregates")
+                    self.reset()
+                    return self.poll()
+                if state is None:
+                    state = self.files[path] = {'offset': 0, 'size': -1, 'header': None, 'skip': False,
+                                                'ino': st.st_ino, 'mtime_ns': None, 'prefix': b'', 'tail': b''}
+                elif st.st_size == state['size'] and st.st_mtime_ns == state['mtime_ns']:
+                    continue
+
+                for df in self._read_new_rows(path, state):
+                    if df.empty:
+                        continue
+                    if path.stem not in self.building_order:
+                        self.building_order.append(path.stem)
+                    self.agg.update(df)
+                    self._fold_points(timestamp_values(df['timestamp']), df['kwh'].to_numpy())
+                    added += len(df)
+                # Only mark the file as caught up once it was read without error.
+                state['size'] = st.st_size
+                state['mtime_ns'] = st.st_mtime_ns
+            except Exception as e:
+                print(f"WARNING: could not read {path.name} ({e}); will retry")
+        return added
+
+    def _fold_points(self, x, y):
+        x = np.concatenate([self.points_x, x.astype('datetime64[ns]')])
+        y = np.concatenate([self.points_y, y])
+        self.points_x, self.points_y = decimate_minmax(x, y, self.scatter_buckets)
+
+    def refresh_outputs(self, scatter_mode="decimate"):
+        data = DashboardData(self.agg, building_order=self.building_order)
+        data.timestamps, data.kwh = self.points_x, self.points_y
+        generate_dashboard(None, data, scatter_mode)
+
+        Path("output").mkdir(exist_ok=True)
+        data.summary.to_csv("output/building_summary.csv")
+        write_summary_report(data.total, data.summary['sum'].idxmax(), data.peak_time)
+
+    def run(self, interval=WATCH_INTERVAL, scatter_mode="decimate"):
+        print(f"\n=== WATCHING {self.data_dir}/ (every {interval}s, Ctrl+C to stop) ===")
+        try:
+            while True:
+                start = time.perf_counter()
+                added = self.poll()
+                if added:
+                    self.refresh_outputs(scatter_mode)
+                    print(f"Folded {added} new readings in {time.perf_counter() - start:.2f}s "
+                          f"({self.agg.rows} total)")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nWatch mode stopped.")
+
+
+def _rss_mb():
+    """Peak resident set size of this process in MB (0 where `resource` is unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _cpu_seconds():
+    """User + system CPU of this process and of its reaped children (the parser pool)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class _StageTimer:
+    def __init__(self, metrics, name, rows):
+        self.metrics = metrics
+        self.record = {'stage': name, 'rows': rows}
+
+    def __enter__(self):
+        if self.metrics.trace_memory:
+            tracemalloc.start()
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        return self.record
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall
+        rec = self.record
+        rec['wall_seconds'] = round(wall, 4)
+        rec['cpu_seconds'] = round(_cpu_seconds() - self._cpu, 4)
+        rec['rows_per_sec'] = round(rec['rows'] / wall, 1) if rec['rows'] and wall > 0 else None
+        rec['peak_rss_mb'] = round(_rss_mb(), 1)
+        if self.metrics.trace_memory:
+            rec['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            tracemalloc.stop()
+        self.metrics.stages.append(rec)
+        return False
+
+
+class PipelineMetrics:
+    """
+    Per-stage wall time, CPU time, rows, rows/sec and peak RSS for a pipeline run.
+    When disabled, stage() hands out one shared no-op context, so the
+    instrumented code costs a method call per stage.
+    """
+    def __init__(self, enabled=False, trace_memory=False, profile_file=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.profile_file = profile_file
+        self.stages = []
+        self._profiler = None
+        self._null = contextlib.nullcontext({})
+
+    def stage(self, name, rows=None):
+        """Context manager timing one stage. Its value is the record dict, so rows can be set inside."""
+        if not self.enabled:
+            return self._null
+        return _StageTimer(self, name, rows)
+
+    def start_profile(self):
+        if self.profile_file:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+            Path(self.profile_file).parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(self.profile_file)
+            print(f"cProfile stats saved as {self.profile_file}")
+            self._profiler = None
+
+    def print_table(self):
+        if not self.stages:
+            return
+        print("\n===== STAGE METRICS =====")
+        print(f"{'stage':<24}{'wall s':>10}{'cpu s':>10}{'rows':>12}{'rows/s':>14}{'peak RSS MB':>14}")
+        for r in self.stages:
+            rows = r['rows'] if r['rows'] is not None else '-'
+            rate = r['rows_per_sec'] if r['rows_per_sec'] is not None else '-'
+            print(f"{r['stage']:<24}{r['wall_seconds']:>10.3f}{r['cpu_seconds']:>10.3f}{rows:>12}{rate:>14}{r['peak_rss_mb']:>14.1f}")
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf-8') as f:
+            json.dump({'finished': datetime.now().isoformat(timespec='seconds'), 'stages': self.stages}, f, indent=2)
+        print(f"Metrics saved as {path}")
+
+
+def make_synthetic_campus(data_dir, buildings=20, readings=8760, malformed_rate=0.001, seed=0,
+                          utc_offset=None):
+    """
+    Write one hourly meter CSV per building into `data_dir` (daily load cycle
+    plus noise and occasional spikes). A `malformed_rate` fraction of rows gets
+    an unparseable timestamp or kWh value. With `utc_offset` (e.g. "+01:00")
+    the timestamps are ISO8601 with that offset, which parses tz-aware.
+    Same seed, same files.
+    """
+    rng = np.random.default_rng(seed)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    times = pd.date_range("2024-01-01", periods=readings, freq="h")
+    if utc_offset:
+        stamps = times.strftime("%Y-%m-%dT%H:%M:%S" + utc_offset).to_numpy(dtype=object)
+    else:
+        stamps = times.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    hours = times.hour.to_numpy()
+
+    for b in range(buildings):
+        base = rng.uniform(20, 200)
+        kwh = base * (1 + 0.4 * np.sin((hours - 6) / 24 * 2 * np.pi)) + rng.normal(0, base * 0.05, readings)
+        spikes = rng.random(readings) < 0.0005
+        kwh[spikes] *= rng.uniform(2, 4, spikes.sum())
+        df = pd.DataFrame({'timestamp': stamps.copy(), 'kwh': np.round(kwh, 3).astype(object)})
+
+        bad = np.flatnonzero(rng.random(readings) < malformed_rate)
+        half = len(bad) // 2
+        df.loc[bad[:half], 'timestamp'] = "not-a-date"
+        df.loc[bad[half:], 'kwh'] = "n/a"
+        df.to_csv(data_dir / f"building{b + 1}.csv", index=False)
+
+
+def run_benchmark(buildings=20, readings=8760, malformed_rate=0.001, seed=0, workers=None,
+                  output_file="output/benchmark.json", trace_memory=False, utc_offset=None):
+    """
+    Time each pipeline stage on a generated campus and write the results as JSON.
+    Every stage records the process's peak RSS afterwards. With `trace_memory`
+    the stage's own peak allocation is traced with tracemalloc as well. That
+    slows allocation-heavy stages and does not see load_all_csv's worker processes.
+    """
+    output_file = Path(output_file).resolve()
+    metrics = PipelineMetrics(enabled=True, trace_memory=trace_memory)
+    results = {
+        'params': {'buildings': buildings, 'readings_per_building': readings,
+                   'malformed_rate': malformed_rate, 'seed': seed, 'workers': workers,
+                   'utc_offset': utc_offset},
+        'versions': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__},
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'stages': metrics.stages,
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with metrics.stage("make_synthetic_campus") as st:
+                make_synthetic_campus("data", buildings, readings, malformed_rate, seed, utc_offset)
+                st['rows'] = buildings * readings
+            with metrics.stage("load_all_csv") as st:
+                df = load_all_csv("data", workers, None)
+                st['rows'] = len(df)
+            results['rows'] = len(df)
+            with metrics.stage("load_from_dataframe", rows=len(df)):
+                BuildingManager().load_from_dataframe(df)
+            with metrics.stage("generate_dashboard", rows=len(df)):
+                generate_dashboard(df)
+            with metrics.stage("export_outputs", rows=len(df)):
+                export_outputs(df)
+        finally:
+            os.chdir(cwd)
+
+    metrics.print_table()
+    results['total_seconds'] = round(sum(s['wall_seconds'] for s in metrics.stages[1:]), 4)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open('w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results saved as {output_file}")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Campus energy dashboard")
+    parser.add_argument("--data-dir", default="data", help="directory of per-building meter CSVs")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="re-parse every CSV instead of using the cache")
+    parser.add_argument("--scatter", choices=["decimate", "density", "raw"], default="decimate",
+                        help="peak-load panel: min/max per pixel column, density raster, or every reading")
+    parser.add_argument("--stream", action="store_true",
+                        help="out-of-core mode: chunked aggregation without building the merged DataFrame")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and refresh the outputs whenever CSVs are added or appended")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="seconds between polls in --watch mode")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE, help="rows per chunk in --stream mode")
+    parser.add_argument("--metrics", action="store_true",
+                        help=f"print per-stage timings and write them to {METRICS_FILE}")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="dump cProfile stats for the whole run to FILE (implies --metrics)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time every stage on a generated data set instead of reading --data-dir")
+    parser.add_argument("--bench-buildings", type=int, default=20)
+    parser.add_argument("--bench-readings", type=int, default=8760, help="readings per building")
+    parser.add_argument("--bench-malformed", type=float, default=0.001, help="fraction of malformed rows")
+    parser.add_argument("--bench-seed", type=int, default=0)
+    parser.add_argument("--bench-utc-offset", metavar="OFFSET", default=None,
+                        help="write ISO8601 timestamps with this UTC offset (e.g. +01:00) to exercise tz-aware input")
+    parser.add_argument("--bench-output", default="output/benchmark.json")
+    parser.add_argument("--bench-trace-memory", action="store_true",
+                        help="also record per-stage tracemalloc peaks (slows the timed stages)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.benchmark:
+        run_benchmark(args.bench_buildings, args.bench_readings, args.bench_malformed,
+                      args.bench_seed, args.workers, args.bench_output, args.bench_trace_memory,
+                      args.bench_utc_offset)
+        return
+    if args.watch:
+        MeterWatcher(args.data_dir).run(args.interval, args.scatter)
+        return
+    if args.stream:
+        run_streaming(args.data_dir, args.workers, args.chunksize)
+        return
+
+    metrics = PipelineMetrics(enabled=args.metrics or bool(args.profile), profile_file=args.profile)
+    metrics.start_profile()
+    try:
+        with metrics.stage("load_all_csv") as st:
+            df = load_all_csv(args.data_dir, args.workers, None if args.no_cache else CACHE_DIR)
+            st['rows'] = len(df)
+
+        if df.empty:
+            print("\nPROGRAM STOPPED: No valid data found.")
+            return
 
-    generate_dashboard(df)
-    export_outputs(df)
+        with metrics.stage("building_manager", rows=len(df)):
+            bm = BuildingManager()
+            bm.load_from_dataframe(df)
+        with metrics.stage("building_report", rows=len(df)):
+            bm.full_report()
 
-    print("\nAll tasks completed successfully!")
+        with metrics.stage("generate_dashboard", rows=len(df)):
+            generate_dashboard(df, scatter_mode=args.scatter)
+        with metrics.stage("export_outputs", rows=len(df)):
+            export_outputs(df)
 
+        print("\nAll tasks completed successfully!")
+    finally:
+        metrics.stop_profile()
+        if metrics.enabled:
+            metrics.print_table()
+            metrics.save(METRICS_FILE)
 
 if __name__ == "__main__":
     main()